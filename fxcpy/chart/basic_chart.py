@@ -67,23 +67,14 @@ class BasicChart(object):
         return ax
 
     def _get_price_action(self, instrument, time_frame, dtfm, dtto):
-        # Get the data
-        data_gen = market_data.get_price_data(
+        # Get the data, sorted and as views of one array per column
+        columns = self.market_data.get_price_columns(
             instrument,
             time_frame,
             to_ole(dtfm),
             to_ole(dtto)
         )
-        data_list = list(data_gen)
-        if len(data_list) > 1:
-            d = np.concatenate(data_list)
-            con_data = d[np.argsort(d['date'])]
-        else:
-            d = data_list[0]
-            con_data = d[np.argsort(d['date'])]
-        # Convert to Pandas
-        pd_data = pd.DataFrame(con_data, index=con_data['date']).drop('date', axis=1)
-        return pd_data
+        return columns.to_pandas()
         
     def graph(self, instrument, time_frame, dtfm, dtto):
         """
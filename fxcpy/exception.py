@@ -21,7 +21,22 @@
 # SOFTWARE.
 #
 class RequestTimeOutError(Exception):
-    pass
+    """
+    dtFirst is the OLE Automation date a price history walk had reached,
+    pass it as dtTo to resume the walk.
+    """
+    def __init__(self, message='', dtFirst=None):
+        super().__init__(message)
+        self.dtFirst = dtFirst
+
+class RequestFailedError(Exception):
+    """
+    The trading server failed a price history request, dtFirst is the
+    OLE Automation date the walk had reached.
+    """
+    def __init__(self, message='', dtFirst=None):
+        super().__init__(message)
+        self.dtFirst = dtFirst
 
 class TableTypeNotFound(Exception):
     pass
@@ -0,0 +1,192 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 James K Bowler, Data Centauri Ltd
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import os
+
+import numpy as np
+
+from fxcpy.factory.coverage import Coverage
+from fxcpy.factory.resample import UNIT_SECONDS, parse_timeframe
+from fxcpy.utils.date_utils import to_ole_array
+
+
+class BarStore(object):
+    """
+    On disk price history, one file per instrument and timeframe.
+
+    Each file is a raw structured array sorted by date and unique on
+    date, so reads are np.memmap slices that share pages between
+    processes instead of copying the data.
+
+    Only one process should write to a store at a time, readers can
+    keep their memmaps open while it is updated.
+
+    Next to each file the Coverage of the series, the date ranges
+    already requested from the server, is kept in a ".cov" file.
+    """
+    def __init__(self, path, dtype):
+        self._path = path
+        self._dtype = np.dtype(dtype)
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    def _filename(self, instrument, timeframe, ext='bars'):
+        return os.path.join(
+            self._path, "{}_{}.{}".format(
+                instrument.replace('/', '_'), timeframe, ext)
+        )
+
+    def _size(self, filename):
+        if not os.path.exists(filename):
+            return 0
+        nbytes = os.path.getsize(filename)
+        if nbytes % self._dtype.itemsize:
+            raise IOError(
+                "{} is not a {} file".format(filename, self._dtype)
+            )
+        return nbytes // self._dtype.itemsize
+
+    def get_dtype(self):
+        return self._dtype
+
+    def load(self, instrument, timeframe):
+        """
+        Read only memmap of every stored bar.
+
+        Returns: Structured Numpy Array
+        """
+        filename = self._filename(instrument, timeframe)
+        size = self._size(filename)
+        if size == 0:
+            return np.empty(0, dtype=self._dtype)
+        return np.memmap(
+            filename, dtype=self._dtype, mode='r', shape=(size,))
+
+    def read(self, instrument, timeframe, dtFrom=None, dtTo=None):
+        """
+        Stored bars between dtFrom and dtTo inclusive, as a slice of the
+        memmap (no copy).
+
+        Params :
+            str "GBP/USD", str "m1", datetime64 or None, datetime64 or None
+
+        Returns: Structured Numpy Array
+        """
+        a = self.load(instrument, timeframe)
+        lo, hi = 0, len(a)
+        if dtFrom is not None:
+            lo = np.searchsorted(
+                a['date'], np.datetime64(dtFrom, 's'), side='left')
+        if dtTo is not None:
+            hi = np.searchsorted(
+                a['date'], np.datetime64(dtTo, 's'), side='right')
+        return a[lo:hi]
+
+    def get_range(self, instrument, timeframe):
+        """
+        First and last stored bar dates.
+
+        Returns: tuple (datetime64, datetime64) or None if nothing is stored
+        """
+        a = self.load(instrument, timeframe)
+        if len(a) == 0:
+            return None
+        return a['date'][0], a['date'][-1]
+
+    def write(self, instrument, timeframe, data):
+        """
+        Merge bars into the store. Bars already stored with the same date
+        are replaced by the new ones.
+        """
+        if len(data) == 0:
+            return
+        data = np.asarray(data, dtype=self._dtype)
+        data = data[np.argsort(data['date'], kind='mergesort')]
+        # Keep the last bar of each date, it is the most recent update
+        last = np.append(data['date'][1:] != data['date'][:-1], True)
+        data = data[last]
+        filename = self._filename(instrument, timeframe)
+        size = self._size(filename)
+        old = self.load(instrument, timeframe)
+        if size and data['date'][0] >= old['date'][-1]:
+            # Append, replacing the last bar if it is being updated
+            keep = size - int(data['date'][0] == old['date'][-1])
+            del old
+            with open(filename, 'r+b') as f:
+                f.seek(keep * self._dtype.itemsize)
+                f.write(data.tobytes())
+        else:
+            merged = np.concatenate([data, old])
+            del old
+            idx = np.unique(merged['date'], return_index=True)[1]
+            tmp = filename + '.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(merged[idx].tobytes())
+            # Readers holding the old file keep a valid mapping
+            os.replace(tmp, filename)
+
+    def get_coverage(self, instrument, timeframe):
+        """
+        Date ranges of the series already requested from the server.
+
+        A store written before coverage was kept is taken to cover each
+        run of consecutive bars up to its last but one bar, the last bar
+        may not have closed. Runs are broken wherever bars are more than
+        one bar apart, so holes, weekends and holidays are requested
+        again once.
+
+        Returns: Coverage
+        """
+        filename = self._filename(instrument, timeframe, 'cov')
+        if os.path.exists(filename):
+            return Coverage(np.fromfile(filename, dtype='<f8').reshape(-1, 2))
+        a = self.load(instrument, timeframe)
+        if len(a) < 2:
+            return Coverage()
+        dates = np.array(a['date'][:-1])
+        unit, size = parse_timeframe(timeframe)
+        # Months are up to 31 days long
+        bar = size * (31 * UNIT_SECONDS['D'] if unit == 'M' else
+                      UNIT_SECONDS[unit])
+        breaks = np.flatnonzero(np.diff(dates).astype(np.int64) > bar)
+        first = np.append(0, breaks + 1)
+        last = np.append(breaks, len(dates) - 1)
+        return Coverage(np.column_stack(
+            [to_ole_array(dates[first]), to_ole_array(dates[last])]))
+
+    def write_coverage(self, instrument, timeframe, coverage):
+        """
+        Saves the Coverage of the series.
+        """
+        filename = self._filename(instrument, timeframe, 'cov')
+        tmp = filename + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(coverage.get_intervals().tobytes())
+        os.replace(tmp, filename)
+
+    def add_coverage(self, instrument, timeframe, dtFrom, dtTo):
+        """
+        Marks dtFrom to dtTo (OLE Automation dates) as requested.
+        """
+        coverage = self.get_coverage(instrument, timeframe)
+        coverage.add(dtFrom, dtTo)
+        self.write_coverage(instrument, timeframe, coverage)
@@ -0,0 +1,139 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 James K Bowler, Data Centauri Ltd
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import numpy as np
+
+
+class PriceColumns(object):
+    """
+    Price history of one instrument and timeframe held as one contiguous
+    array per field, sorted by date.
+
+    Built from the pages of MarketData.get_price_data(), each field is
+    copied once into its column, the pages are not concatenated or
+    sorted first. The pandas and Arrow views share the column memory.
+    """
+    def __init__(self, instrument, timeframe, columns):
+        """
+        Params :
+            str "GBP/USD", str "m1", dict of field name: 1-D Numpy Array
+            with the 'date' column first
+        """
+        self.instrument = instrument
+        self.timeframe = timeframe
+        self._columns = columns
+
+    @classmethod
+    def from_pages(cls, instrument, timeframe, pages):
+        """
+        Params :
+            str "GBP/USD", str "m1", iterable of Structured Numpy Arrays
+            in the order get_price_data() yields them, newest first
+
+        Pages overlap where one request ends and the next one starts, the
+        rows of a newer page up to the last date of the older page are
+        dropped, so ticks sharing a timestamp with the page boundary are
+        kept once.
+
+        Returns : PriceColumns
+        """
+        # [page, first row kept] from the newest page to the oldest
+        kept = []
+        dtype = None
+        for page in pages:
+            if len(page) == 0:
+                continue
+            dtype = page.dtype
+            dates = page['date']
+            if np.any(dates[1:] < dates[:-1]):
+                page = page[np.argsort(dates, kind='mergesort')]
+            last = page['date'][-1]
+            while kept:
+                newer = kept[-1]
+                newer[1] += np.searchsorted(
+                    newer[0]['date'][newer[1]:], last, side='right')
+                if newer[1] < len(newer[0]):
+                    break
+                kept.pop()
+            kept.append([page, 0])
+        if dtype is None:
+            return cls(instrument, timeframe, {})
+        total = sum(len(page) - start for page, start in kept)
+        columns = dict(
+            (name, np.empty(total, dtype=dtype[name]))
+            for name in dtype.names
+        )
+        end = total
+        for i, (page, start) in enumerate(kept):
+            size = len(page) - start
+            for name in dtype.names:
+                columns[name][end - size:end] = page[name][start:]
+            end -= size
+            # Let the page be freed as soon as it is copied
+            kept[i] = page = None
+        return cls(instrument, timeframe, columns)
+
+    def __len__(self):
+        if not self._columns:
+            return 0
+        return len(self._columns['date'])
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    def get_names(self):
+        return list(self._columns)
+
+    def to_pandas(self):
+        """
+        DataFrame indexed by date with one column per price field.
+
+        With pandas 2 or later the index and columns are views of this
+        object's arrays, nothing is copied.
+
+        Returns : pandas.DataFrame
+        """
+        import pandas as pd
+        if not self._columns:
+            return pd.DataFrame()
+        index = pd.Index(self._columns['date'], name='date', copy=False)
+        return pd.DataFrame(
+            dict(
+                (name, column) for name, column in self._columns.items()
+                if name != 'date'
+            ),
+            index=index,
+            copy=False
+        )
+
+    def to_arrow(self):
+        """
+        Arrow table with one column per field including date, the buffers
+        are the Numpy columns (zero-copy). Requires pyarrow.
+
+        Returns : pyarrow.Table
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("PriceColumns.to_arrow() requires pyarrow")
+        return pa.table(self._columns)
@@ -0,0 +1,105 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 James K Bowler, Data Centauri Ltd
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import numpy as np
+
+
+class Coverage(object):
+    """
+    Date ranges of a series that have already been requested from the
+    trading server, as sorted, non-overlapping closed intervals of OLE
+    Automation dates.
+
+    A covered range holds every bar of the series in that range, which
+    may be none at all (weekends, holidays), so it never needs to be
+    requested again.
+    """
+    # Gaps shorter than this (about 8.6 seconds) are not worth a request
+    min_gap = 0.0001
+
+    def __init__(self, intervals=None):
+        """
+        Optional :
+            > array-like of (from, to) OLE Automation date pairs
+        """
+        self._intervals = np.empty((0, 2), dtype='<f8')
+        if intervals is not None:
+            for dtFrom, dtTo in np.asarray(intervals, dtype='<f8'):
+                self.add(dtFrom, dtTo)
+
+    def __len__(self):
+        return len(self._intervals)
+
+    def get_intervals(self):
+        """
+        Returns : Numpy Array of shape (n, 2), from and to of each range
+        """
+        return self._intervals.copy()
+
+    def add(self, dtFrom, dtTo):
+        """
+        Marks dtFrom to dtTo as covered, merging it with the ranges it
+        overlaps or touches.
+        """
+        if dtTo < dtFrom:
+            return
+        a = self._intervals
+        # Ranges ending before dtFrom and starting after dtTo are kept
+        lo = np.searchsorted(a[:, 1], dtFrom, side='left')
+        hi = np.searchsorted(a[:, 0], dtTo, side='right')
+        if lo < hi:
+            dtFrom = min(dtFrom, a[lo, 0])
+            dtTo = max(dtTo, a[hi - 1, 1])
+        self._intervals = np.concatenate(
+            [a[:lo], [[dtFrom, dtTo]], a[hi:]])
+
+    def split(self, dtFrom, dtTo):
+        """
+        Splits dtFrom to dtTo into covered and missing parts.
+
+        Returns : list of (from, to, bool covered), newest first
+        """
+        a = self._intervals
+        a = a[(a[:, 1] >= dtFrom) & (a[:, 0] <= dtTo)]
+        parts = []
+        end = dtTo
+        for start, stop in a[::-1].tolist():
+            stop = min(stop, dtTo)
+            if end - stop > self.min_gap:
+                parts.append((stop, end, False))
+            start = max(start, dtFrom)
+            parts.append((start, stop, True))
+            end = start
+        if end - dtFrom > self.min_gap:
+            parts.append((dtFrom, end, False))
+        return parts
+
+    def gaps(self, dtFrom, dtTo):
+        """
+        Missing parts of dtFrom to dtTo, newest first.
+
+        Returns : list of (from, to)
+        """
+        return [
+            (start, stop) for start, stop, covered
+            in self.split(dtFrom, dtTo) if not covered
+        ]
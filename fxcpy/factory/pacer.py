@@ -0,0 +1,103 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 James K Bowler, Data Centauri Ltd
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+class Pacer(object):
+    """
+    Retry and pacing policy of MarketData history requests.
+
+    A request that times out is sent again up to `retries` times, after
+    waiting backoff * 2 ** (attempt - 1) seconds, at most max_backoff.
+
+    Response times are compared with the fastest one seen so far. While
+    they average more than twice as long the server is slowing down, so
+    requests are paused for about the extra time (up to max_delay) and
+    fewer are kept in flight, timeouts double the pause and halve the
+    requests in flight. Both recover as responses speed up.
+    """
+    # Response times within this many seconds of the fastest are normal
+    slack = 0.05
+    # Smallest share of max_requests kept in flight
+    min_share = 0.05
+
+    def __init__(
+        self, timeout=10, retries=3, backoff=1.0, max_backoff=60.0,
+        max_delay=5.0
+    ):
+        if retries < 0:
+            raise AttributeError("retries can not be negative")
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_delay = max_delay
+        self._fastest = None
+        self._latency = None
+        self._delay = 0.0
+        self._share = 1.0
+
+    def get_delay(self):
+        """
+        Seconds to wait before sending the next request.
+        """
+        return self._delay
+
+    def get_limit(self, max_requests):
+        """
+        Number of requests to keep in flight, out of max_requests.
+        """
+        return max(1, int(max_requests * self._share))
+
+    def get_backoff(self, attempt):
+        """
+        Seconds to wait before retry number attempt (from 1).
+        """
+        return min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+
+    def on_response(self, elapsed):
+        """
+        Records the response time in seconds of a completed request.
+        """
+        if self._fastest is None or elapsed < self._fastest:
+            self._fastest = elapsed
+        if self._latency is None:
+            self._latency = elapsed
+        else:
+            self._latency = 0.8 * self._latency + 0.2 * elapsed
+        if self._latency > 2 * self._fastest + self.slack:
+            # Pause for about as long as responses are delayed
+            self._delay = min(
+                self.max_delay,
+                max(self._delay, self._latency - self._fastest)
+            )
+            self._share = max(self.min_share, self._share * 0.9)
+        elif self._latency < 1.5 * self._fastest + self.slack:
+            self._delay = self._delay / 2 if self._delay > 0.01 else 0.0
+            self._share = min(1.0, self._share * 1.25)
+
+    def on_timeout(self):
+        """
+        Records a request that timed out.
+        """
+        self._delay = min(self.max_delay, max(self._delay * 2, 0.1))
+        self._share = max(self.min_share, self._share / 2)
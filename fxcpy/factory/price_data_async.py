@@ -0,0 +1,83 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 James K Bowler, Data Centauri Ltd
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# Async generators need Python 3.6, they are kept out of price_history so
+# that MarketData can still be imported by Python 3.5
+import asyncio
+
+
+async def get_price_data_async(
+    market_data, instrument, timeframe, dtFrom, dtTo, incWeekendData,
+    PriceMode, out=None, compact_ticks=False, timeout=None
+):
+    """
+    Async generator behind MarketData.get_price_data_async().
+    """
+    md = market_data
+    dtFrom, dtTo = md._check_dates(dtFrom, dtTo)
+    if not md._stores(timeframe, incWeekendData, PriceMode):
+        async for data in _walk(
+            md, md._new_job(instrument, timeframe, dtFrom, dtTo),
+            incWeekendData, PriceMode, out, compact_ticks, timeout
+        ):
+            yield data
+        return
+    for part in md._store_parts(instrument, timeframe, dtFrom, dtTo):
+        if not isinstance(part, tuple):
+            yield part
+            continue
+        job = md._new_job(instrument, timeframe, part[0], part[1])
+        with md._storing(job, out) as keep:
+            async for data in _walk(
+                md, job, incWeekendData, PriceMode, out, timeout=timeout
+            ):
+                keep(data)
+                yield data
+
+
+async def _walk(
+    md, job, incWeekendData, PriceMode, out=None, compact_ticks=False,
+    timeout=None
+):
+    """
+    Same as MarketData._walk, waiting for each page and pausing on the
+    event loop.
+    """
+    pacer = md._pacer
+    if timeout is None:
+        timeout = pacer.timeout
+    md._start_job(job)
+    try:
+        while md._job_pending(job):
+            if pacer.get_delay():
+                await asyncio.sleep(pacer.get_delay())
+            handle = md._send_job(job, incWeekendData, PriceMode)
+            if not await handle.wait_async(timeout):
+                await asyncio.sleep(md._job_timed_out(handle, job))
+                continue
+            pacer.on_response(md._elapsed(handle, job))
+            data = md._job_page(handle, job, out, compact_ticks)
+            if data is None:
+                break
+            yield data
+    finally:
+        md._end_job(job)
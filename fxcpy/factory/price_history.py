@@ -20,17 +20,35 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 #
-from fxcpy.exception import RequestTimeOutError
+from fxcpy.exception import RequestFailedError, RequestTimeOutError
 
 from forexconnect import (
     MarketDataSnapshot,
-    O2GCandleOpenPriceMode
+    O2GCandleOpenPriceMode,
+    O2GTimeframeUnit
 )
 
-from fxcpy.utils.date_utils import to_ole, fm_ole
+from fxcpy.utils.date_utils import OLE_DAY, to_ole, fm_ole, fm_ole_array
+from fxcpy.factory.resample import (
+    BAR_DTYPE,
+    TICK_DTYPE,
+    COMPACT_TICK_DTYPE,
+    period_starts
+)
+from fxcpy.factory.columns import PriceColumns
+from fxcpy.factory.pacer import Pacer
 
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from itertools import islice
+from threading import Lock
 import numpy as np
+import select
+import time
+
+from ..logger import Log
+log = Log().logger
 
 
 class MarketData(object):
@@ -39,43 +57,84 @@ class MarketData(object):
     
     TODO...
     """
+    # dtype() field and MarketDataSnapshot reader getter for each bar column
+    _bar_getters = (
+        ('askopen', 'getAskOpen'),
+        ('askhigh', 'getAskHigh'),
+        ('asklow', 'getAskLow'),
+        ('askclose', 'getAskClose'),
+        ('bidopen', 'getBidOpen'),
+        ('bidhigh', 'getBidHigh'),
+        ('bidlow', 'getBidLow'),
+        ('bidclose', 'getBidClose'),
+        ('volume', 'getVolume')
+    )
+    # tick_dtype() field and reader getter for each tick column
+    _tick_getters = (
+        ('ask', 'getAsk'),
+        ('bid', 'getBid')
+    )
+    # Free requests kept for reuse per (instrument, timeframe), more
+    # than the requests in flight at once are never needed
+    _free_requests = 8
+
     def __init__(
         self, session, response_listener,
-        response_reader_factory, request_factory
+        response_reader_factory, request_factory, bar_store=None,
+        verify_week=False, pacer=None, request_cache_size=64
     ):        
         """
         TODO...
+
+        Optional :
+            > BarStore consulted before requesting bars from the server
+            > bool check the locally computed trading week against the
+              latest GBP/USD D1 bar once, on the first get_trading_week()
+            > Pacer retrying timed out requests and spacing them out
+              when the server slows down, Pacer() by default
+            > int number of (instrument, timeframe) series whose
+              requests are kept for reuse, up to 8 requests each
         """
         self.session = session
         self.response_listener = response_listener
         self.response_reader_factory = response_reader_factory
         self.request_factory = request_factory
-        MAJORPAIR='GBP/USD'
-        DAILY='D1'
-        data_gen = self.get_price_data(MAJORPAIR, DAILY, -1.0,0.0)
-        data = next(data_gen)
-        init_dt = data['date'].max().item()
-        if init_dt.weekday() == 6: # Its Sunday
-            self._wk_str = init_dt
-        else:
-            self._wk_str = init_dt - timedelta(days=init_dt.weekday()+1)
-        self._wk_end = self._wk_str + timedelta(days=5)
+        self._bar_store = bar_store
+        self._pacer = Pacer() if pacer is None else pacer
+        self._tails = {}
+        # IO2GTimeframe by name, and free requests by (instrument,
+        # timeframe) in least recently used order
+        self._timeframes = {}
+        self._requests = OrderedDict()
+        self._requests_lock = Lock()
+        self._request_cache_size = request_cache_size
+        # Request IDs with a send that timed out
+        self._abandoned = set()
+        # Computed by get_trading_week(), no request is made at startup
+        self._wk_str = None
+        self._wk_end = None
+        self._wk_next = None
+        self._verify_week = verify_week
 
     def dtype(self):
         """
         TODO...
         """
-        return np.dtype(
-            [('date', 'datetime64[s]'), ('askopen', '<f8'),
-             ('askhigh', '<f8'), ('asklow', '<f8'),
-             ('askclose', '<f8'), ('bidopen', '<f8'),
-             ('bidhigh', '<f8'), ('bidlow', '<f8'),
-             ('bidclose', '<f8'), ('volume', '<i8')]
-        )
+        return BAR_DTYPE
+
+    def tick_dtype(self, compact=False):
+        """
+        dtype of tick data, dates are kept to the millisecond.
+
+        compact=True stores the prices as float32, halving the memory
+        used by the prices.
+        """
+        return COMPACT_TICK_DTYPE if compact else TICK_DTYPE
 
     def get_price_data(
         self, instrument, timeframe, dtFrom, dtTo, incWeekendData=False,
-        PriceMode=O2GCandleOpenPriceMode.PreviousClose
+        PriceMode=O2GCandleOpenPriceMode.PreviousClose, out=None,
+        compact_ticks=False
     ):  
         """
         Params :
@@ -86,6 +145,24 @@ class MarketData(object):
         Optional :
             > bool for weekend data
             > PreviousClose or FirstTick
+            > Structured Numpy Array of dtype() to fill instead of
+              allocating a new array for every page. It must hold at
+              least one page (the timeframe query depth) and each page
+              is a view of it, only valid until the next page is read.
+            > bool float32 prices for tick data, see tick_dtype()
+
+        When a BarStore is set, stored bars are read from disk and only
+        the gaps in its coverage, the ranges not requested before, are
+        requested from the server. The store only holds bars without
+        weekend data in PreviousClose mode, other bars are always
+        requested.
+
+        Timed out requests are retried as set by the Pacer. When it gives
+        up, RequestTimeOutError.dtFirst is the date the walk had reached,
+        request dtFrom to dtFirst to resume. With a BarStore the pages
+        already received are stored, so repeating the same call resumes.
+        A request failed by the server raises RequestFailedError, with
+        the same dtFirst.
             
         Returns : Structured Numpy Array
         np.array([
@@ -103,6 +180,565 @@ class MarketData(object):
             dtype=[('date', '<M8[s]'), ('askopen', '<f8'), ('askhigh', '<f8'), ('asklow', '<f8'), ('askclose', '<f8'),
                   ('bidopen', '<f8'), ('bidhigh', '<f8'), ('bidlow', '<f8'), ('bidclose', '<f8'), ('volume', '<i8')]
         )
+
+        For tick timeframes ("t1") the array is of tick_dtype()
+        np.array([
+            ('2018-03-08T22:00:00.120', 1.38549, 1.38486),
+            ('2018-03-08T22:00:00.310', 1.38551, 1.38488)],
+            dtype=[('date', '<M8[ms]'), ('ask', '<f8'), ('bid', '<f8')]
+        )
+        """
+        dtFrom, dtTo = self._check_dates(dtFrom, dtTo)
+        if not self._stores(timeframe, incWeekendData, PriceMode):
+            yield from self._walk(
+                self._new_job(instrument, timeframe, dtFrom, dtTo),
+                incWeekendData, PriceMode, out, compact_ticks
+            )
+            return
+        for part in self._store_parts(instrument, timeframe, dtFrom, dtTo):
+            if not isinstance(part, tuple):
+                yield part
+                continue
+            job = self._new_job(instrument, timeframe, part[0], part[1])
+            with self._storing(job, out) as keep:
+                for data in self._walk(job, incWeekendData, PriceMode, out):
+                    keep(data)
+                    yield data
+
+    def get_price_data_async(
+        self, instrument, timeframe, dtFrom, dtTo, incWeekendData=False,
+        PriceMode=O2GCandleOpenPriceMode.PreviousClose, out=None,
+        compact_ticks=False, timeout=None
+    ):
+        """
+        Same as get_price_data as an async generator for asyncio, pages
+        are awaited on the running event loop instead of blocking a
+        thread, so one loop can drive many downloads:
+
+            async for data in market_data.get_price_data_async(
+                "GBP/USD", "m1", dtFrom, dtTo):
+                ...
+
+        Optional :
+            > int seconds to wait for each page, by default the timeout
+              of the Pacer
+
+        Requires Python 3.6 or later.
+        """
+        from fxcpy.factory.price_data_async import get_price_data_async
+        return get_price_data_async(
+            self, instrument, timeframe, dtFrom, dtTo, incWeekendData,
+            PriceMode, out, compact_ticks, timeout
+        )
+
+    def _store_parts(self, instrument, timeframe, dtFrom, dtTo):
+        """
+        Splits dtFrom to dtTo by the coverage of the bar store, newest
+        first.
+
+        Yields the stored bars of covered ranges, and a (from, to) tuple
+        for each range that has to be requested.
+        """
+        if dtTo <= 0.0:
+            dtTo = to_ole(datetime.utcnow())
+        if dtFrom <= 0.0:
+            # Only the latest page can be requested, it is not cached
+            yield dtFrom, dtTo
+            return
+        parts = self._bar_store.get_coverage(
+            instrument, timeframe).split(dtFrom, dtTo)
+        for i, (start, stop, covered) in enumerate(parts):
+            if not covered:
+                yield start, stop
+                continue
+            cached = self._bar_store.read(
+                instrument, timeframe, fm_ole(start), fm_ole(stop))
+            # Bars on the edge of a gap are returned by its request
+            if i > 0 and not parts[i - 1][2] and len(cached) and \
+                    cached['date'][-1] == fm_ole_array(stop):
+                cached = cached[:-1]
+            if i + 1 < len(parts) and not parts[i + 1][2] and \
+                    len(cached) and cached['date'][0] == fm_ole_array(start):
+                cached = cached[1:]
+            if len(cached):
+                yield cached
+
+    def get_price_columns(
+        self, instrument, timeframe, dtFrom, dtTo, incWeekendData=False,
+        PriceMode=O2GCandleOpenPriceMode.PreviousClose, compact_ticks=False
+    ):
+        """
+        Same as get_price_data, the whole range is returned as one
+        PriceColumns sorted by date, with the rows repeated at page
+        boundaries removed. Use its to_pandas() or to_arrow() views
+        instead of concatenating and sorting the pages.
+
+        Returns : PriceColumns
+        """
+        return PriceColumns.from_pages(
+            instrument, timeframe, self.get_price_data(
+                instrument, timeframe, dtFrom, dtTo, incWeekendData,
+                PriceMode, compact_ticks=compact_ticks
+            )
+        )
+
+    def _stores(self, timeframe, incWeekendData, PriceMode):
+        """
+        True if bars requested with these settings are kept in the bar
+        store. The store is keyed by instrument and timeframe only, so
+        it holds the default bars alone.
+        """
+        return (
+            self._bar_store is not None and not timeframe.startswith('t')
+            and not incWeekendData
+            and PriceMode == O2GCandleOpenPriceMode.PreviousClose
+        )
+
+    @contextmanager
+    def _storing(self, job, out=None):
+        """
+        Collects the pages of a walk passed to the function it returns,
+        and writes them to the bar store on exit. The range of the job is
+        added to the coverage if no exception, nor the consumer closing
+        the generator, ended the walk early. No coverage is added when
+        the server failed a page.
+        """
+        pages = []
+        complete = False
+        failed = False
+
+        def keep(data):
+            # A caller buffer is overwritten by the next page
+            pages.append(data if out is None else data.copy())
+
+        try:
+            yield keep
+            complete = True
+        except RequestFailedError:
+            failed = True
+            raise
+        finally:
+            self._store_pages(
+                job['instrument'], job['timeframe'], job['dtFrom'],
+                job['dtTo'], pages, complete, not failed
+            )
+
+    def _store_pages(
+        self, instrument, timeframe, dtFrom, dtTo, pages, complete,
+        cover=True
+    ):
+        """
+        Writes the pages requested for dtFrom to dtTo to the bar store,
+        with the range they cover if the walk did not complete, or with
+        no range unless cover.
+        """
+        if not cover:
+            if pages:
+                # A store without coverage is taken to cover its bars,
+                # keep the coverage from before the write
+                coverage = self._bar_store.get_coverage(instrument, timeframe)
+                self._bar_store.write(
+                    instrument, timeframe, np.concatenate(pages))
+                self._bar_store.write_coverage(instrument, timeframe, coverage)
+            return
+        if pages:
+            self._bar_store.write(
+                instrument, timeframe, np.concatenate(pages))
+        if complete and dtFrom > 0.0:
+            self._add_coverage(instrument, timeframe, dtFrom, dtTo)
+        elif pages:
+            # From the oldest page received, pages are newest first
+            self._add_coverage(
+                instrument, timeframe,
+                to_ole(pages[-1]['date'][0].item()), dtTo
+            )
+
+    def _add_coverage(self, instrument, timeframe, dtFrom, dtTo):
+        """
+        Adds dtFrom to dtTo to the coverage of the series, leaving out
+        the bars that may still be open.
+        """
+        _timeframe = self._get_timeframe(timeframe)
+        bar = self._unit_days[_timeframe.getUnit()] * _timeframe.getSize()
+        dtTo = min(dtTo, to_ole(datetime.utcnow()) - bar)
+        if dtTo >= dtFrom:
+            self._bar_store.add_coverage(instrument, timeframe, dtFrom, dtTo)
+
+    def _walk(
+        self, job, incWeekendData, PriceMode, out=None, compact_ticks=False,
+        timeout=None
+    ):
+        """
+        Requests the range of a job from _new_job() one page at a time,
+        from the newest page to the oldest, paced and retried by the
+        Pacer.
+
+        The steps are shared with the async walk and _run_jobs, only the
+        waiting differs.
+        """
+        pacer = self._pacer
+        if timeout is None:
+            timeout = pacer.timeout
+        self._start_job(job)
+        try:
+            while self._job_pending(job):
+                if pacer.get_delay():
+                    time.sleep(pacer.get_delay())
+                handle = self._send_job(job, incWeekendData, PriceMode)
+                if not handle.wait(timeout):
+                    # Retry the same page, the pages before it are kept
+                    time.sleep(self._job_timed_out(handle, job))
+                    continue
+                pacer.on_response(self._elapsed(handle, job))
+                data = self._job_page(handle, job, out, compact_ticks)
+                if data is None:
+                    break
+                yield data
+        finally:
+            self._end_job(job)
+
+    def _new_job(self, instrument, timeframe, dtFrom, dtTo):
+        """
+        A walk of dtFrom to dtTo, dtFirst is the oldest date it has
+        reached. Its request is taken by _send_job() and given back by
+        _end_job().
+
+        Returns : dict
+        """
+        return {
+            'instrument': instrument,
+            'timeframe': timeframe,
+            'dtFrom': dtFrom,
+            'dtTo': dtTo,
+            'dtFirst': dtTo,
+            'request': None
+        }
+
+    def _start_job(self, job):
+        _timeframe = self._get_timeframe(job['timeframe'])
+        job['depth'] = _timeframe.getQueryDepth()
+        job['epsilon'] = self._walk_epsilon(_timeframe)
+        job['attempt'] = 0
+        job['pages'] = 0
+        job['done'] = False
+
+    def _walk_epsilon(self, _timeframe):
+        """
+        Dates of a walk closer than this are the same date, one
+        millisecond for ticks and half a bar for bars.
+        """
+        unit = _timeframe.getUnit()
+        if unit not in self._unit_days:
+            return 1.0 / OLE_DAY['ms']
+        return self._unit_days[unit] * _timeframe.getSize() / 2
+
+    def _job_pending(self, job):
+        """
+        True while the job has pages left to request, the first page is
+        always requested.
+        """
+        if job['done']:
+            return False
+        if not job['pages']:
+            return job['dtFirst'] >= job['dtFrom']
+        return job['dtFirst'] - job['dtFrom'] > job['epsilon']
+
+    def _send_job(self, job, incWeekendData, PriceMode):
+        """
+        Sends the request of the next page of a job.
+
+        Returns: RequestHandle
+        """
+        if job['request'] is None:
+            job['request'] = self._create_request(
+                job['instrument'], job['timeframe'])
+        handle = self._send_request(
+            job['request'], job['dtFrom'], job['dtFirst'],
+            incWeekendData, PriceMode
+        )
+        job['sent'] = time.time()
+        return handle
+
+    def _end_job(self, job):
+        """
+        Gives the request of a job back for reuse.
+        """
+        if job['request'] is not None:
+            self._release_request(
+                job['instrument'], job['timeframe'], job['request'])
+            job['request'] = None
+
+    @staticmethod
+    def _elapsed(handle, job):
+        """
+        Seconds from sending the page to its response arriving.
+        """
+        return (handle.done_at or time.time()) - job['sent']
+
+    def _job_timed_out(self, handle, job):
+        """
+        Abandons the timed out page of a job, the same page is sent
+        again after the backoff returned, or RequestTimeOutError is
+        raised once the job is out of retries.
+
+        Every send of a request carries the same request ID, so the
+        retry goes out on a new request. On the abandoned one a late
+        response would be taken for the response of the next page.
+
+        Returns: float seconds to wait before the retry
+        """
+        self._abandon(handle)
+        # Dropped, see _release_request()
+        self._end_job(job)
+        self._pacer.on_timeout()
+        job['attempt'] += 1
+        if job['attempt'] > self._pacer.retries:
+            raise RequestTimeOutError(
+                "{} {} timeout error".format(
+                    job['instrument'], job['timeframe']),
+                job['dtFirst']
+            )
+        return self._pacer.get_backoff(job['attempt'])
+
+    def _job_page(self, handle, job, out=None, compact_ticks=False):
+        """
+        Reads the page of a completed request and moves the job back to
+        its oldest date, or raises RequestFailedError if the server
+        failed the request.
+
+        Returns: Structured Numpy Array, or None when the job is done
+        """
+        if handle.has_error():
+            raise RequestFailedError(
+                "{} {} request failed: {}".format(
+                    job['instrument'], job['timeframe'], handle.get_error()),
+                job['dtFirst']
+            )
+        job['attempt'] = 0
+        reader = self._create_reader(handle)
+        if not reader or job['pages'] and \
+                abs(job['dtFirst'] - reader.getDate(0)) <= job['epsilon']:
+            # No data, or no older data than the previous page
+            job['done'] = True
+            return None
+        # Switch to earlest date
+        job['dtFirst'] = reader.getDate(0)
+        job['pages'] += 1
+        data = self._read_snapshot(reader, out, compact_ticks)
+        # A page shorter than the query depth holds the rest of the range,
+        # many ticks can share the date of the oldest one
+        if len(data) < job['depth']:
+            job['done'] = True
+        return data
+
+    def get_price_data_many(
+        self, instruments, timeframes, dtFrom, dtTo, incWeekendData=False,
+        PriceMode=O2GCandleOpenPriceMode.PreviousClose, max_requests=8,
+        timeout=None, compact_ticks=False
+    ):
+        """
+        Downloads every instrument and timeframe combination, keeping up
+        to `max_requests` snapshot requests in flight at the same time.
+
+        Params :
+            list ["GBP/USD", "EUR/USD"], list ["m1", "H1"],
+            float 0.0 or datetime, float 0.0 or datetime
+
+        Optional :
+            > bool for weekend data
+            > PreviousClose or FirstTick
+            > int maximum number of requests in flight
+            > int seconds to wait for a single response, by default the
+              timeout of the Pacer
+            > bool float32 prices for tick data, see tick_dtype()
+
+        Pages are yielded as soon as their response arrives, so pages of
+        different series are interleaved and each series is returned
+        from the newest page to the oldest, as with get_price_data.
+
+        Returns : Generator of tuples
+        (instrument, timeframe, Structured Numpy Array, elapsed seconds)
+        """
+        dtFrom, dtTo = self._check_dates(dtFrom, dtTo)
+        jobs = [
+            self._new_job(instrument, timeframe, dtFrom, dtTo)
+            for instrument in instruments
+            for timeframe in timeframes
+        ]
+        for job, data, elapsed in self._run_jobs(
+            jobs, incWeekendData, PriceMode, max_requests, timeout,
+            compact_ticks
+        ):
+            yield job['instrument'], job['timeframe'], data, elapsed
+
+    def plan_windows(self, timeframe, dtFrom, dtTo):
+        """
+        Splits dtFrom to dtTo into consecutive windows of at most one
+        page of bars each (the timeframe query depth), so every window
+        can be requested independently.
+
+        Params :
+            str "m1", float or datetime, float or datetime
+
+        Returns : list of (float, float) OLE Automation date ranges,
+        from the newest window to the oldest. Neighbouring windows share
+        their boundary date.
+        """
+        dtFrom, dtTo = self._check_dates(dtFrom, dtTo)
+        if dtFrom <= 0.0:
+            raise AttributeError("dtFrom is required to plan windows")
+        if dtTo <= 0.0:
+            dtTo = to_ole(datetime.utcnow())
+        _timeframe = self._get_timeframe(timeframe)
+        unit = _timeframe.getUnit()
+        if unit not in self._unit_days:
+            raise AttributeError(
+                "Time frame {} can not be planned".format(timeframe)
+            )
+        bar = self._unit_days[unit] * _timeframe.getSize()
+        span = bar * max(_timeframe.getQueryDepth() - 1, 1)
+        windows = []
+        while dtTo - dtFrom > 0.0001:
+            windows.append((max(dtFrom, dtTo - span), dtTo))
+            dtTo -= span
+        return windows
+
+    def get_price_data_parallel(
+        self, instrument, timeframe, dtFrom, dtTo, incWeekendData=False,
+        PriceMode=O2GCandleOpenPriceMode.PreviousClose, max_requests=8,
+        timeout=None
+    ):
+        """
+        Same as get_price_data, but the range is split up front with
+        plan_windows() and the windows are requested concurrently, with
+        up to `max_requests` requests in flight.
+
+        Params :
+            str "GBP/USD", str "m1", float or datetime, float or datetime
+
+        Optional :
+            > bool for weekend data
+            > PreviousClose or FirstTick
+            > int maximum number of requests in flight
+            > int seconds to wait for a single response, by default the
+              timeout of the Pacer
+
+        Returns : Structured Numpy Array, sorted by date with the bars
+        shared by neighbouring windows removed
+        """
+        jobs = [
+            self._new_job(instrument, timeframe, window[0], window[1])
+            for window in self.plan_windows(timeframe, dtFrom, dtTo)
+        ]
+        pages = [
+            data for job, data, elapsed in self._run_jobs(
+                jobs, incWeekendData, PriceMode, max_requests, timeout)
+        ]
+        if not pages:
+            return np.empty(0, dtype=self.dtype())
+        data = np.concatenate(pages)
+        return data[np.unique(data['date'], return_index=True)[1]]
+
+    def _run_jobs(
+        self, jobs, incWeekendData, PriceMode, max_requests, timeout,
+        compact_ticks=False
+    ):
+        """
+        Walks each job from _new_job() with up to `max_requests`
+        requests in flight.
+
+        Returns : Generator of tuples
+        (job, Structured Numpy Array, elapsed seconds)
+        """
+        if max_requests < 1:
+            raise AttributeError("max_requests must be at least 1")
+        pacer = self._pacer
+        if timeout is None:
+            timeout = pacer.timeout
+        pending = list(reversed(jobs))
+        # Timed out jobs waiting for their backoff before a retry
+        retrying = []
+        in_flight = {}
+        try:
+            while pending or in_flight or retrying:
+                # Top up the requests in flight, retries first
+                while len(in_flight) < pacer.get_limit(max_requests):
+                    now = time.time()
+                    due = [j for j in retrying if j['retry_at'] <= now]
+                    if due:
+                        job = due[0]
+                        retrying.remove(job)
+                    elif pending:
+                        job = pending.pop()
+                        self._start_job(job)
+                        if not self._job_pending(job):
+                            continue
+                    else:
+                        break
+                    in_flight[self._send_job(
+                        job, incWeekendData, PriceMode)] = job
+                wait = float('inf')
+                if in_flight:
+                    oldest = min(j['sent'] for j in in_flight.values())
+                    wait = oldest + timeout - time.time()
+                if retrying:
+                    wait = min(
+                        wait,
+                        min(j['retry_at'] for j in retrying) - time.time()
+                    )
+                if not in_flight:
+                    if retrying:
+                        time.sleep(max(wait, 0))
+                    continue
+                # Wait for the first response to arrive
+                ready = select.select(list(in_flight), [], [], max(wait, 0))[0]
+                if not ready:
+                    self._retry_jobs(in_flight, retrying, timeout)
+                    continue
+                # Time every response before the first yield, the time the
+                # consumer takes is not server latency
+                received = time.time()
+                responses = []
+                for handle in ready:
+                    job = in_flight.pop(handle)
+                    handle.done_at = handle.done_at or received
+                    elapsed = self._elapsed(handle, job)
+                    pacer.on_response(elapsed)
+                    responses.append((handle, job, elapsed))
+                for handle, job, elapsed in responses:
+                    data = self._job_page(handle, job, None, compact_ticks)
+                    if data is not None and self._job_pending(job):
+                        in_flight[self._send_job(
+                            job, incWeekendData, PriceMode)] = job
+                    else:
+                        # Free for the next job, one request per job in
+                        # flight at most
+                        self._end_job(job)
+                    if data is not None:
+                        yield job, data, elapsed
+        finally:
+            for handle in in_flight:
+                self._abandon(handle)
+            for job in jobs:
+                self._end_job(job)
+
+    def _retry_jobs(self, in_flight, retrying, timeout):
+        """
+        Moves the jobs of _run_jobs that timed out from in_flight to
+        retrying, or raises RequestTimeOutError once a job is out of
+        retries.
+        """
+        now = time.time()
+        for handle, job in list(in_flight.items()):
+            if now - job['sent'] < timeout:
+                continue
+            del in_flight[handle]
+            job['retry_at'] = now + self._job_timed_out(handle, job)
+            retrying.append(job)
+
+    def _check_dates(self, dtFrom, dtTo):
+        """
+        Returns both dates as float (OLE Automation)
         """
         if isinstance(dtFrom, datetime):
             dtFrom = to_ole(dtFrom)
@@ -114,7 +750,15 @@ class MarketData(object):
             raise AttributeError(
                 "Dates must be float (OLE Automation) or python datetime"
             )
-            
+        return dtFrom, dtTo
+
+    def _get_timeframe(self, timeframe):
+        """
+        Returns the IO2GTimeframe of timeframe, e.g. "m1"
+        """
+        _timeframe = self._timeframes.get(timeframe)
+        if _timeframe is not None:
+            return _timeframe
         # Timeframe param check
         timeframeCollection = self.request_factory.getTimeFrameCollection()
         _timeframe = timeframeCollection.get(timeframe)
@@ -122,6 +766,26 @@ class MarketData(object):
             raise AttributeError(
                 "Time frame {} not supported".format(timeframe)
             )
+        self._timeframes[timeframe] = _timeframe
+        return _timeframe
+
+    def _create_request(self, instrument, timeframe):
+        """
+        Returns a MarketDataSnapshot request for instrument and timeframe,
+        reusing one given back with _release_request() when possible.
+
+        A request is only used by one caller at a time, as its date range
+        is filled in before each send.
+        """
+        key = (instrument, timeframe)
+        with self._requests_lock:
+            free = self._requests.get(key)
+            if free:
+                request = free.pop()
+                if not free:
+                    del self._requests[key]
+                return request
+        _timeframe = self._get_timeframe(timeframe)
         # Create MarketDataSnapshot request
         request = self.request_factory.createMarketDataSnapshotRequestInstrument(
             instrument, _timeframe, _timeframe.getQueryDepth())
@@ -129,77 +793,263 @@ class MarketData(object):
             raise NameError(
                 "Request not found, check request_factory or instrument spelling"
             )
-        
-        dtFirst = dtTo
-        while dtFirst - dtFrom > 0.0001:
-            # Request data range
-            self.request_factory.fillMarketDataSnapshotRequestTime(
-                request, dtFrom, dtFirst, incWeekendData, PriceMode
+        return request
+
+    def _release_request(self, instrument, timeframe, request):
+        """
+        Gives a request from _create_request() back for reuse. Requests
+        with a send that timed out are dropped, a late response would
+        otherwise be taken for the response of the next send.
+        """
+        key = (instrument, timeframe)
+        with self._requests_lock:
+            if request.getRequestID() in self._abandoned:
+                self._abandoned.discard(request.getRequestID())
+                return
+            free = self._requests.setdefault(key, [])
+            if len(free) < self._free_requests:
+                free.append(request)
+            self._requests.move_to_end(key)
+            # Evict the least recently used series
+            while len(self._requests) > self._request_cache_size:
+                self._requests.popitem(last=False)
+
+    def _abandon(self, handle):
+        """
+        Stops waiting for the response of handle, see _release_request().
+        """
+        self.response_listener.unregister_request(handle.request_id)
+        with self._requests_lock:
+            self._abandoned.add(handle.request_id)
+
+    def _send_request(
+        self, request, dtFrom, dtTo, incWeekendData, PriceMode
+    ):
+        """
+        Fills the date range of the request and sends it.
+
+        Returns: RequestHandle
+        """
+        self.request_factory.fillMarketDataSnapshotRequestTime(
+            request, dtFrom, dtTo, incWeekendData, PriceMode
+        )
+        # Route the response for this request to its own handle
+        handle = self.response_listener.register_request(
+            request.getRequestID())
+        self.session.sendRequest(request)
+        return handle
+
+    def _create_reader(self, handle):
+        """
+        Returns the MarketDataSnapshot reader for a completed request,
+        or None if the request did not return any price data.
+        """
+        response = handle.get_response()
+        if (response and response.getType() == MarketDataSnapshot):
+            reader = self.response_reader_factory.createMarketDataSnapshotReader(
+                response)
+            if reader and reader.size() > 0:
+                return reader
+
+    def _read_snapshot(self, reader, out=None, compact_ticks=False):
+        """
+        Extract data from a MarketDataSnapshot reader, one column at a
+        time into a single preallocated array.
+
+        Returns: Structured Numpy Array of dtype() for bars or
+        tick_dtype() for ticks
+        """
+        size = reader.size()
+        if reader.isBar():
+            dtype = self.dtype()
+            unit = 's'
+            getters = self._bar_getters
+        else:  # isTick()
+            dtype = self.tick_dtype(compact_ticks)
+            unit = 'ms'
+            getters = self._tick_getters
+        if out is None:
+            out = np.empty(size, dtype=dtype)
+        elif out.dtype != dtype or len(out) < size:
+            raise AttributeError(
+                "out must be a {} array of at least {} rows".format(
+                    dtype, size)
             )
-            self.session.sendRequest(request)
-            # Catch timeout errors
-            if not self.response_listener.wait_events():
-                raise RequestTimeOutError("waitEvents() timeout error")
-            
-            else:
-                # Grap response and create reader
-                response = self.response_listener.get_response()
-                if (response and response.getType() == MarketDataSnapshot):
-                    reader = self.response_reader_factory.createMarketDataSnapshotReader(response)
-                    if reader:
-                        if (abs(dtFirst - reader.getDate(0)) > 0.0001):
-                            # Switch to earlest date
-                            dtFirst = reader.getDate(0)
-                        else:
-                            break
-                    else:
-                        break
-                    # Extract data from response
-                    rows = []
-                    for ii in range(reader.size()):
-                        dt = reader.getDate(ii);
-                        if reader.isBar():
-                            rows.append((fm_ole(dt),
-                                reader.getAskOpen(ii),
-                                reader.getAskHigh(ii),
-                                reader.getAskLow(ii),
-                                reader.getAskClose(ii),
-                                reader.getBidOpen(ii),
-                                reader.getBidHigh(ii),
-                                reader.getBidLow(ii),
-                                reader.getBidClose(ii),
-                                reader.getVolume(ii))
-                            )
-                        else:  # isTick()
-                            rows.append((fm_ole(dt),
-                                reader.getAsk(ii),
-                                reader.getBid(ii))
-                            )
-                    # Structured numpy array
-                    yield np.array(rows, dtype=self.dtype())
-                else:
-                    break
-                    
-    def check_bars(self, a):
+        else:
+            out = out[:size]
+        out['date'] = fm_ole_array(
+            np.fromiter(map(reader.getDate, range(size)), np.float64, size),
+            unit
+        )
+        for field, getter in getters:
+            get = getattr(reader, getter)
+            column = out[field]
+            for ii in range(size):
+                column[ii] = get(ii)
+        return out
+
+    def sync_tail(
+        self, instrument, timeframe, since=None,
+        PriceMode=O2GCandleOpenPriceMode.PreviousClose
+    ):
+        """
+        Brings the series of instrument and timeframe up to date by
+        requesting only the bars from its last bar onwards.
+
+        The series is kept in the BarStore when one is set, otherwise in
+        memory, see get_tail(). FirstTick series are always kept in
+        memory.
+
+        Params :
+            str "GBP/USD", str "m1"
+
+        Optional :
+            > datetime or float (OLE Automation) to start an empty series
+              from, by default an empty series starts with the latest page
+            > PreviousClose or FirstTick
+
+        Returns : Structured Numpy Array of the new bars, and of the last
+        bar of the series if it has been updated since the last sync
+        """
+        if timeframe.startswith('t'):
+            raise AttributeError("sync_tail only supports bar timeframes")
+        series = self.get_tail(instrument, timeframe, PriceMode)
+        dtTo = to_ole(datetime.utcnow())
+        if len(series):
+            dtFrom = to_ole(series['date'][-1].item())
+            # Always request the last bar, even if it has just opened
+            dtTo = max(dtTo, dtFrom + 0.001)
+        elif since is not None:
+            dtFrom = self._check_dates(since, dtTo)[0]
+        if len(series) or since is not None:
+            pages = list(self._walk(self._new_job(
+                instrument, timeframe, dtFrom, dtTo), False, PriceMode))
+        else:
+            walk = self._walk(self._new_job(
+                instrument, timeframe, -1.0, 0.0), False, PriceMode)
+            pages = list(islice(walk, 1))
+            walk.close()
+            if pages:
+                dtFrom = to_ole(pages[0]['date'][0].item())
+        if not pages:
+            return np.empty(0, dtype=self.dtype())
+        data = np.concatenate(pages)
+        data = data[np.unique(data['date'], return_index=True)[1]]
+        if len(series):
+            # Only keep the last bar of the series if it has changed
+            data = data[data['date'] >= series['date'][-1]]
+            if len(data) and (data[:1] == series[-1:])[0]:
+                data = data[1:]
+        if len(data) == 0:
+            return data
+        if self._stores(timeframe, False, PriceMode):
+            self._bar_store.write(instrument, timeframe, data)
+            self._add_coverage(instrument, timeframe, dtFrom, dtTo)
+        else:
+            keep = np.searchsorted(series['date'], data['date'][0])
+            self._tails[(instrument, timeframe, PriceMode)] = np.concatenate(
+                [series[:keep], data])
+        return data
+
+    def get_tail(
+        self, instrument, timeframe,
+        PriceMode=O2GCandleOpenPriceMode.PreviousClose
+    ):
+        """
+        The series maintained by sync_tail.
+
+        Optional :
+            > PreviousClose or FirstTick
+
+        Returns : Structured Numpy Array
+        """
+        if self._stores(timeframe, False, PriceMode):
+            return self._bar_store.load(instrument, timeframe)
+        return self._tails.get(
+            (instrument, timeframe, PriceMode),
+            np.empty(0, dtype=self.dtype())
+        )
+
+    def set_bar_store(self, bar_store):
+        """
+        Sets the BarStore consulted by get_price_data, None disables it.
+        """
+        self._bar_store = bar_store
+
+    def get_bar_store(self):
+        return self._bar_store
+
+    def set_pacer(self, pacer):
+        """
+        Sets the Pacer of history requests.
+        """
+        self._pacer = pacer
+
+    def get_pacer(self):
+        return self._pacer
+
+    # Length in days of one unit of each bar timeframe, months and years
+    # are rounded up so that a planned window never exceeds one page
+    _unit_days = {
+        O2GTimeframeUnit.Min: 1.0 / 1440,
+        O2GTimeframeUnit.Hour: 1.0 / 24,
+        O2GTimeframeUnit.Day: 1.0,
+        O2GTimeframeUnit.Week: 7.0,
+        O2GTimeframeUnit.Month: 31.0,
+        O2GTimeframeUnit.Year: 366.0
+    }
+
+    # check_bars rules, each field pair must satisfy a[first] >= a[second]
+    _bar_rules = (
+        ('askhigh', 'asklow'),
+        ('askhigh', 'askopen'),
+        ('askopen', 'asklow'),
+        ('askhigh', 'askclose'),
+        ('askclose', 'asklow'),
+        ('bidhigh', 'bidlow'),
+        ('bidhigh', 'bidopen'),
+        ('bidopen', 'bidlow'),
+        ('bidhigh', 'bidclose'),
+        ('bidclose', 'bidlow')
+    )
+
+    def check_bars(self, a, report=False):
         """
         Optional integrity check
+
+        Drops bars whose high/low do not contain their open/close or
+        with a negative volume, and keeps the last bar of each date.
+        Bars are returned from the newest to the oldest.
+
+        Optional :
+            > bool also return a report of the bars dropped
+
+        Returns : Structured Numpy Array, or a tuple of the array and a
+        dict of the number of bars failing each rule, e.g.
+        {'askhigh >= asklow': 0, ..., 'volume >= 0': 0,
+         'duplicates': array of the duplicated dates}
         """
-        if not type(a).__name__ == 'ndarray':
+        if not type(a).__name__ in ('ndarray', 'memmap'):
             raise AttributeError("Data must be numpy.ndarray")
-        a = a[a['askhigh'] >= a['asklow']]
-        a = a[a['askhigh'] >= a['askopen']]
-        a = a[a['asklow'] <= a['askopen']]
-        a = a[a['askhigh'] >= a['askclose']]
-        a = a[a['asklow'] <= a['askclose']]
-        a = a[a['bidhigh'] >= a['bidlow']]
-        a = a[a['bidhigh'] >= a['bidopen']]
-        a = a[a['bidlow'] <= a['bidopen']]
-        a = a[a['bidhigh'] >= a['bidclose']]
-        a = a[a['bidlow'] <= a['bidclose']]
-        a = a[a['volume'] >= 0]
-        idx = np.unique(a['date'][::-1], return_index=True)[1]
-        return a[::-1][idx][::-1]
-                    
+        valid = a['volume'] >= 0
+        failed = {}
+        for high, low in self._bar_rules:
+            ok = a[high] >= a[low]
+            failed['{} >= {}'.format(high, low)] = int(
+                len(a) - np.count_nonzero(ok))
+            valid &= ok
+        failed['volume >= 0'] = int(len(a) - np.count_nonzero(a['volume'] >= 0))
+        # Sort once, the last bar of each date wins
+        idx = np.flatnonzero(valid)
+        idx = idx[np.argsort(a['date'][idx], kind='mergesort')]
+        dates = a['date'][idx]
+        dup = dates[1:] == dates[:-1]
+        failed['duplicates'] = np.unique(dates[1:][dup])
+        idx = idx[np.append(~dup, True)]
+        if report:
+            return a[idx[::-1]], failed
+        return a[idx[::-1]]
+
     def get_open_datetime(self, offer):
         """
         Tries to determine what time the market opened for a given 
@@ -233,9 +1083,53 @@ class MarketData(object):
     def get_trading_week(self):
         """
         Returns the current trading week range.
+
+        The week starts on Sunday at 17:00 New York time and ends five
+        days later, it is computed locally from the FXCM week rules and
+        cached until the next week starts.
+
+        Returns : tuple (datetime, datetime) in UTC
         """
+        utc_now = datetime.utcnow()
+        if self._wk_str is None or utc_now >= self._wk_next:
+            now = np.array([utc_now], dtype='datetime64[s]')
+            self._wk_str = period_starts(now, 'W1')[0].item()
+            self._wk_end = self._wk_str + timedelta(days=5)
+            # The next week starts an hour earlier or later in UTC when
+            # New York clocks change, an hour past seven days is always
+            # within it
+            after = np.array(
+                [self._wk_str + timedelta(days=7, hours=1)],
+                dtype='datetime64[s]'
+            )
+            self._wk_next = period_starts(after, 'W1')[0].item()
+            if self._verify_week:
+                self._verify_week = False
+                self.verify_trading_week()
         return self._wk_str, self._wk_end
 
+    def verify_trading_week(self):
+        """
+        Checks the computed trading week against the date of the latest
+        GBP/USD D1 bar, which is the start of the current (or, at the
+        weekend, the last) trading day.
+
+        Returns : bool, a warning is logged when they differ
+        """
+        wk_str, wk_end = self._wk_str, self._wk_end
+        if wk_str is None:
+            wk_str, wk_end = self.get_trading_week()
+        data_gen = self.get_price_data('GBP/USD', 'D1', -1.0, 0.0)
+        data = next(data_gen)
+        last_day = data['date'].max().item()
+        if wk_str <= last_day < wk_end:
+            return True
+        log.warning(
+            "Trading week {} - {} does not contain the last D1 bar {}".format(
+                wk_str, wk_end, last_day)
+        )
+        return False
+
     def get_current_bar(self, offer, time_frame):
         """
         Gets the current bar date time
@@ -0,0 +1,179 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 James K Bowler, Data Centauri Ltd
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+import numpy as np
+
+# Seconds in one unit of each FXCM timeframe prefix, months are handled
+# on their own
+UNIT_SECONDS = {
+    'm': 60,
+    'H': 3600,
+    'D': 86400,
+    'W': 604800
+}
+
+# The FXCM trading day starts at 17:00 New York time, 7 hours before
+# midnight
+DAY_START = 7 * 3600
+
+EST = -5 * 3600
+EDT = -4 * 3600
+
+# Returned by MarketData.dtype()
+BAR_DTYPE = np.dtype(
+    [('date', 'datetime64[s]'), ('askopen', '<f8'),
+     ('askhigh', '<f8'), ('asklow', '<f8'),
+     ('askclose', '<f8'), ('bidopen', '<f8'),
+     ('bidhigh', '<f8'), ('bidlow', '<f8'),
+     ('bidclose', '<f8'), ('volume', '<i8')]
+)
+
+# Returned by MarketData.tick_dtype(), float32 prices with compact=True
+TICK_DTYPE = np.dtype(
+    [('date', 'datetime64[ms]'), ('ask', '<f8'), ('bid', '<f8')]
+)
+COMPACT_TICK_DTYPE = np.dtype(
+    [('date', 'datetime64[ms]'), ('ask', '<f4'), ('bid', '<f4')]
+)
+
+
+def parse_timeframe(timeframe):
+    """
+    Splits an FXCM timeframe into its unit and size, e.g. "H4" returns
+    ("H", 4).
+    """
+    unit, size = timeframe[:1], timeframe[1:]
+    if unit not in UNIT_SECONDS and unit != 'M' or not size.isdigit():
+        raise AttributeError(
+            "Time frame {} not supported".format(timeframe)
+        )
+    return unit, int(size)
+
+
+def new_york_offset(dates):
+    """
+    UTC offset in seconds of New York time for each date, using the US
+    daylight saving rules in force since 2007 (second Sunday of March to
+    first Sunday of November, at 2:00 local time).
+
+    Returns: int64 array
+    """
+    dates = np.asarray(dates, dtype='datetime64[s]')
+    years, idx = np.unique(
+        dates.astype('datetime64[Y]'), return_inverse=True)
+    march = (years.astype('datetime64[M]') + 2).astype('datetime64[D]')
+    november = (years.astype('datetime64[M]') + 10).astype('datetime64[D]')
+    # datetime64[D] zero is a Thursday, Sunday is 6 days after Monday
+    march_sunday = march + (3 - march.astype(np.int64)) % 7 + 7
+    november_sunday = november + (3 - november.astype(np.int64)) % 7
+    dst_start = march_sunday + np.timedelta64(7, 'h')
+    dst_end = november_sunday + np.timedelta64(6, 'h')
+    summer = (dates >= dst_start[idx.ravel()]) & (dates < dst_end[idx.ravel()])
+    return np.where(summer, EDT, EST)
+
+
+def period_starts(dates, timeframe, trading_day=True):
+    """
+    Start date of the timeframe period each date falls into.
+
+    With trading_day=True periods follow the FXCM trading day, which
+    runs from 17:00 to 17:00 New York time, so D1 periods start at 21:00
+    or 22:00 UTC and W1 periods start on Sunday at 17:00 New York time.
+    Otherwise periods are aligned to UTC midnight and weeks start on
+    Monday.
+
+    Returns: datetime64[s] array
+    """
+    unit, size = parse_timeframe(timeframe)
+    secs = np.asarray(dates, dtype='datetime64[s]').astype(np.int64)
+    if trading_day:
+        offset = new_york_offset(dates)
+        shift = offset + DAY_START
+    else:
+        shift = np.zeros(len(secs), dtype=np.int64)
+    # Seconds since the epoch on a clock where each day starts at 00:00
+    local = secs + shift
+    if unit == 'M':
+        months = local.astype('datetime64[s]').astype('datetime64[M]')
+        months = months.astype(np.int64) // size * size
+        start = months.astype('datetime64[M]').astype(
+            'datetime64[s]').astype(np.int64)
+    elif unit == 'W':
+        # datetime64 zero is a Thursday, weeks start 3 days later
+        week = UNIT_SECONDS['W'] * size
+        start = (local + 3 * 86400) // week * week - 3 * 86400
+    else:
+        period = UNIT_SECONDS[unit] * size
+        start = local // period * period
+    if trading_day:
+        # Use the offset in force when the period starts, it differs from
+        # the offset of the date when a period spans a daylight saving
+        # change
+        shift = new_york_offset(
+            (start - shift).astype('datetime64[s]')) + DAY_START
+    return (start - shift).astype('datetime64[s]')
+
+
+def resample(a, timeframe, trading_day=True):
+    """
+    Builds timeframe bars from lower timeframe bars or from ticks.
+
+    Params :
+        Structured Numpy Array of MarketData.dtype() or
+        MarketData.tick_dtype(), str "H4"
+
+    Optional :
+        > bool periods follow the FXCM trading day, see period_starts()
+
+    Volume is summed for bars and is the number of ticks for ticks.
+    Only periods containing data are returned.
+
+    Returns: Structured Numpy Array of MarketData.dtype()
+    """
+    if len(a) == 0:
+        return np.empty(0, dtype=BAR_DTYPE)
+    if np.any(a['date'][1:] < a['date'][:-1]):
+        a = a[np.argsort(a['date'], kind='mergesort')]
+    starts = period_starts(a['date'], timeframe, trading_day)
+    first = np.flatnonzero(np.append(True, starts[1:] != starts[:-1]))
+    last = np.append(first[1:], len(a)) - 1
+    out = np.empty(len(first), dtype=BAR_DTYPE)
+    out['date'] = starts[first]
+    tick = 'ask' in a.dtype.names
+    for side in ('ask', 'bid'):
+        if tick:
+            price = a[side]
+            opens = highs = lows = closes = price
+        else:
+            opens = a[side + 'open']
+            highs = a[side + 'high']
+            lows = a[side + 'low']
+            closes = a[side + 'close']
+        out[side + 'open'] = opens[first]
+        out[side + 'close'] = closes[last]
+        out[side + 'high'] = np.maximum.reduceat(highs, first)
+        out[side + 'low'] = np.minimum.reduceat(lows, first)
+    if tick:
+        out['volume'] = last - first + 1
+    else:
+        out['volume'] = np.add.reduceat(a['volume'], first)
+    return out
@@ -0,0 +1,308 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 James K Bowler, Data Centauri Ltd
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+from threading import Lock
+
+import numpy as np
+
+from fxcpy.factory.resample import TICK_DTYPE, COMPACT_TICK_DTYPE
+
+
+def tick_dtype(compact=False):
+    """
+    Same as MarketData.tick_dtype()
+    """
+    return COMPACT_TICK_DTYPE if compact else TICK_DTYPE
+
+
+class CompactTicks(object):
+    """
+    Ticks of one instrument held as integers, 16 bytes per tick.
+
+    Dates are int64 millisecond deltas from a base date and prices are
+    int32 offsets from a base price, counted in the smallest price
+    increment of the instrument (10 ** -digits, a tenth of a pip for
+    5 digit pairs). Decoding divides by 10 ** digits, which gives back
+    exactly the float64 prices returned by get_price_data.
+    """
+    dtype = np.dtype([('date', '<i8'), ('ask', '<i4'), ('bid', '<i4')])
+
+    def __init__(self, digits, capacity=0):
+        self.digits = digits
+        self._scale = 10 ** digits
+        self._base_date = None
+        self._base_price = None
+        # Ticks are held in self._data[self._start:self._start + self._size]
+        # with free room on both sides, get_price_data yields the newest
+        # page first so older pages are written in front of the stored ones
+        self._data = np.empty(capacity, dtype=self.dtype)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def nbytes(self):
+        return self._size * self.dtype.itemsize
+
+    def encode(self, ticks):
+        """
+        Params :
+            Structured Numpy Array of tick_dtype() or PriceColumns of ticks
+
+        Returns : Numpy Array of CompactTicks.dtype
+        """
+        dates = np.asarray(ticks['date'], dtype='datetime64[ms]')
+        ask = np.asarray(ticks['ask'])
+        bid = np.asarray(ticks['bid'])
+        out = np.empty(len(dates), dtype=self.dtype)
+        if len(out) == 0:
+            return out
+        if self._base_date is None:
+            self._base_date = dates.min().astype('datetime64[D]').astype(
+                'datetime64[ms]')
+            self._base_price = int(np.rint(bid[0] * self._scale))
+        out['date'] = (dates - self._base_date).astype(np.int64)
+        for name, price in (('ask', ask), ('bid', bid)):
+            units = np.rint(price.astype(np.float64) * self._scale)
+            offsets = units - self._base_price
+            if len(offsets) and (
+                offsets.min() < np.iinfo(np.int32).min or
+                offsets.max() > np.iinfo(np.int32).max
+            ):
+                raise AttributeError(
+                    "{} prices do not fit int32 offsets".format(name))
+            out[name] = offsets
+            # Prices off the 10 ** -digits grid can not be stored exactly
+            if not np.array_equal(
+                self._prices(out[name], price.dtype), price
+            ):
+                raise AttributeError(
+                    "{} prices have more than {} digits".format(
+                        name, self.digits)
+                )
+        return out
+
+    def _prices(self, offsets, dtype=np.float64):
+        prices = (offsets.astype(np.int64) + self._base_price) / self._scale
+        return prices.astype(dtype)
+
+    def decode(self, rows, compact=False):
+        """
+        Params :
+            Numpy Array of CompactTicks.dtype
+
+        Returns : Structured Numpy Array of tick_dtype(compact)
+        """
+        out = np.empty(len(rows), dtype=tick_dtype(compact))
+        if len(rows) == 0:
+            return out
+        out['date'] = self._base_date + rows['date'].astype('timedelta64[ms]')
+        out['ask'] = self._prices(rows['ask'], out['ask'].dtype)
+        out['bid'] = self._prices(rows['bid'], out['bid'].dtype)
+        return out
+
+    def rows(self):
+        """
+        Encoded ticks sorted by date, a view of the internal buffer.
+        """
+        return self._data[self._start:self._start + self._size]
+
+    def add(self, ticks):
+        """
+        Adds ticks sorted by date. Stored ticks from the first to the last
+        date of ticks are replaced, so overlapping pages are not stored
+        twice.
+        """
+        rows = self.encode(ticks)
+        if len(rows) == 0:
+            return
+        if np.any(rows['date'][1:] < rows['date'][:-1]):
+            rows = rows[np.argsort(rows['date'], kind='mergesort')]
+        stored = self.rows()
+        lo = np.searchsorted(stored['date'], rows['date'][0], side='left')
+        hi = np.searchsorted(stored['date'], rows['date'][-1], side='right')
+        if hi == self._size:
+            self._put(lo, rows)
+        elif lo == 0:
+            self._put_front(hi, rows)
+        else:
+            self._data = np.concatenate([stored[:lo], rows, stored[hi:]])
+            self._start = 0
+            self._size = len(self._data)
+
+    def append(self, ticks):
+        """
+        Appends ticks sorted by date and not older than the last stored
+        tick, e.g. live prices. Nothing is replaced, ticks sharing the
+        last stored millisecond are kept.
+        """
+        rows = self.encode(ticks)
+        if len(rows) == 0:
+            return
+        if self._size and rows['date'][0] < self.rows()['date'][-1]:
+            raise AttributeError("ticks are older than the last stored tick")
+        self._put(self._size, rows)
+
+    def _put(self, lo, rows):
+        """
+        Writes rows from position lo, dropping the rows after them and
+        growing the buffer geometrically.
+        """
+        size = lo + len(rows)
+        start = self._start
+        if start + size > len(self._data):
+            data = np.empty(
+                start + max(size, 2 * (len(self._data) - start)), self.dtype)
+            data[start:start + lo] = self._data[start:start + lo]
+            self._data = data
+        self._data[start + lo:start + size] = rows
+        self._size = size
+
+    def _put_front(self, hi, rows):
+        """
+        Writes rows in front of the stored rows from position hi, dropping
+        the rows before them and keeping as much free room in front as
+        is stored, so that paging back in time copies each tick O(1) times.
+        """
+        start = self._start + hi - len(rows)
+        size = len(rows) + self._size - hi
+        if start < 0:
+            data = np.empty(2 * size, self.dtype)
+            data[size + len(rows):] = self.rows()[hi:]
+            self._data = data
+            start = size
+        self._data[start:start + len(rows)] = rows
+        self._start = start
+        self._size = size
+
+    def read(self, dtFrom=None, dtTo=None, compact=False):
+        """
+        Decoded ticks between dtFrom and dtTo inclusive.
+
+        Params :
+            datetime64 or None, datetime64 or None
+
+        Returns : Structured Numpy Array of tick_dtype(compact)
+        """
+        rows = self.rows()
+        lo, hi = 0, len(rows)
+        if self._base_date is not None:
+            if dtFrom is not None:
+                lo = np.searchsorted(rows['date'], self._delta(dtFrom), 'left')
+            if dtTo is not None:
+                hi = np.searchsorted(rows['date'], self._delta(dtTo), 'right')
+        return self.decode(rows[lo:hi], compact)
+
+    def _delta(self, date):
+        return int((np.datetime64(date, 'ms') - self._base_date).astype(
+            np.int64))
+
+    def get_range(self):
+        """
+        Returns : tuple (datetime64, datetime64) or None if empty
+        """
+        if self._size == 0:
+            return None
+        rows = self.rows()
+        return tuple(
+            self._base_date + np.timedelta64(int(rows['date'][i]), 'ms')
+            for i in (0, -1)
+        )
+
+
+class TickStore(object):
+    """
+    In memory tick history of many instruments, see CompactTicks.
+
+    The price precision of each instrument is read from the OffersTable
+    (get_digits) unless it is set with set_digits().
+    """
+    def __init__(self, offers_table=None):
+        self._offers_table = offers_table
+        self._digits = {}
+        self._series = {}
+        self._lock = Lock()
+
+    def set_digits(self, instrument, digits):
+        self._digits[instrument] = digits
+
+    def get_digits(self, instrument):
+        if instrument not in self._digits:
+            if self._offers_table is None:
+                raise AttributeError(
+                    "Digits of {} unknown, use set_digits()".format(
+                        instrument)
+                )
+            offer_id = self._offers_table.find_offer_id(instrument)
+            digits = self._offers_table.get_digits(offer_id) \
+                if offer_id else None
+            if digits is None:
+                raise AttributeError(
+                    "{} not found in the offers table".format(instrument))
+            self._digits[instrument] = digits
+        return self._digits[instrument]
+
+    def get_series(self, instrument):
+        """
+        Returns : CompactTicks of instrument
+        """
+        with self._lock:
+            if instrument not in self._series:
+                self._series[instrument] = CompactTicks(
+                    self.get_digits(instrument))
+            return self._series[instrument]
+
+    def add(self, instrument, ticks):
+        """
+        Params :
+            str "GBP/USD", Structured Numpy Array of tick_dtype() (a page
+            of get_price_data) or PriceColumns from get_price_columns
+        """
+        series = self.get_series(instrument)
+        with self._lock:
+            series.add(ticks)
+
+    def append(self, instrument, ticks):
+        """
+        Appends ticks newer than those stored, see CompactTicks.append().
+        """
+        series = self.get_series(instrument)
+        with self._lock:
+            series.append(ticks)
+
+    def read(self, instrument, dtFrom=None, dtTo=None, compact=False):
+        """
+        Ticks of instrument in the get_price_data format.
+
+        Returns : Structured Numpy Array of tick_dtype(compact)
+        """
+        series = self.get_series(instrument)
+        with self._lock:
+            return series.read(dtFrom, dtTo, compact)
+
+    def get_instruments(self):
+        return list(self._series)
+
+    def nbytes(self):
+        return sum(series.nbytes for series in self._series.values())
@@ -0,0 +1,234 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 James K Bowler, Data Centauri Ltd
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+from forexconnect import CTableListener
+from forexconnect import (
+    O2GTable,
+    IO2GOffersTable,
+    IO2GOfferRow,
+    O2GTableUpdateType
+)
+
+from fxcpy.factory.resample import (
+    BAR_DTYPE,
+    UNIT_SECONDS,
+    parse_timeframe,
+    period_starts
+)
+from fxcpy.utils.date_utils import OLE_ZERO, OLE_DAY
+
+from queue import Queue
+from threading import Lock
+import numpy as np
+
+from . import Counter
+
+OLE_ZERO_SECONDS = int(OLE_ZERO.astype('datetime64[s]').astype(np.int64))
+
+from ..logger import Log
+log = Log().logger
+
+
+class CandleBuilder(CTableListener):
+    """
+    Builds bid/ask candles of several timeframes from the live prices of
+    the Offers table, without requesting any price history.
+
+    Each Offers update is a tick of its instrument. The in-progress bar
+    of every instrument and timeframe is available from get_bar(), and
+    every closed bar is put on the queue as a tuple
+    (instrument, timeframe, bar), where bar is a record of
+    MarketData.dtype() and volume is the number of ticks.
+
+    A bar is closed by the first tick of the next period, so an
+    instrument that stops ticking keeps its last bar open.
+    """
+    def __init__(self, timeframes, trading_day=True, queue=None):
+        super().__init__()
+        log.debug("")
+        for timeframe in timeframes:
+            parse_timeframe(timeframe)
+        self._refcount = Counter(1)
+        self._timeframes = list(timeframes)
+        self._trading_day = trading_day
+        self._queue = Queue() if queue is None else queue
+        self._lock = Lock()
+        # Longest length of each timeframe, a period start plus this
+        # length falls in the next period
+        self._lengths = [
+            self._max_length(tf, trading_day) for tf in self._timeframes
+        ]
+        # Periods of these timeframes all have the same length, whole
+        # hour daylight saving shifts can not move them
+        self._fixed = [
+            self._is_fixed(tf, trading_day) for tf in self._timeframes
+        ]
+        # instrument: [[period end, period start, askopen, askhigh, asklow,
+        #               askclose, bidopen, bidhigh, bidlow, bidclose,
+        #               volume], ...] for each timeframe
+        self._bars = {}
+
+    @staticmethod
+    def _max_length(timeframe, trading_day):
+        unit, size = parse_timeframe(timeframe)
+        if unit == 'M':
+            return 31 * 86400 * size
+        if trading_day and unit in ('D', 'W'):
+            # Daylight saving can lengthen a trading day by an hour
+            return UNIT_SECONDS[unit] * size + 3600
+        return UNIT_SECONDS[unit] * size
+
+    @staticmethod
+    def _is_fixed(timeframe, trading_day):
+        unit, size = parse_timeframe(timeframe)
+        if unit == 'M':
+            return False
+        return not trading_day or 3600 % (UNIT_SECONDS[unit] * size) == 0
+
+    def _period_start(self, i, date):
+        return int(period_starts(
+            np.array([date], dtype='datetime64[s]'),
+            self._timeframes[i], self._trading_day
+        ).astype(np.int64)[0])
+
+    # C++ CallBack
+    def addRef(self):
+        self._refcount.increment()
+        ref = self._refcount.value
+        return ref
+
+    # C++ CallBack
+    def release(self):
+        self._refcount.decrement()
+        ref = self._refcount.value
+        if self._refcount.value == 0:
+            del self
+        return ref
+
+    # C++ CallBack
+    def _on_added(self, rowID, row):
+        pass
+
+    # C++ CallBack
+    def _on_changed(self, rowID, row):
+        row.__class__ = IO2GOfferRow
+        if not (row.isBidValid() and row.isAskValid() and row.isTimeValid()):
+            return
+        self.on_tick(
+            row.getInstrument(), row.getTime(), row.getBid(), row.getAsk())
+
+    # C++ CallBack
+    def _on_deleted(self, rowID, row):
+        pass
+
+    # C++ CallBack
+    def _on_status_changed(self, status):
+        pass
+
+    def on_tick(self, instrument, oletime, bid, ask):
+        """
+        Adds a tick to every timeframe of instrument, closing the bars
+        whose period has ended.
+        """
+        # Seconds since the epoch, bars are plain lists while in progress
+        date = int(round(oletime * OLE_DAY['s'])) + OLE_ZERO_SECONDS
+        with self._lock:
+            bars = self._bars.get(instrument)
+            if bars is None:
+                bars = [None] * len(self._timeframes)
+                self._bars[instrument] = bars
+            for i, bar in enumerate(bars):
+                if bar is not None and bar[1] <= date < bar[0]:
+                    self._update(bar, bid, ask)
+                    continue
+                if bar is not None:
+                    if date < bar[1]:
+                        # Out of order tick from a closed period
+                        continue
+                    self._queue.put(
+                        (instrument, self._timeframes[i], self._record(bar)))
+                start = self._period_start(i, date)
+                if self._fixed[i]:
+                    end = start + self._lengths[i]
+                else:
+                    # The next period starts where this one ends
+                    end = self._period_start(i, start + self._lengths[i])
+                bars[i] = [
+                    end, start, ask, ask, ask, ask, bid, bid, bid, bid, 1
+                ]
+
+    @staticmethod
+    def _update(bar, bid, ask):
+        if ask > bar[3]:
+            bar[3] = ask
+        if ask < bar[4]:
+            bar[4] = ask
+        if bid > bar[7]:
+            bar[7] = bid
+        if bid < bar[8]:
+            bar[8] = bid
+        bar[5] = ask
+        bar[9] = bid
+        bar[10] += 1
+
+    @staticmethod
+    def _record(bar):
+        """
+        In-progress bar list to a record of MarketData.dtype()
+        """
+        return np.array(
+            [(np.datetime64(bar[1], 's'),) + tuple(bar[2:])],
+            dtype=BAR_DTYPE
+        )[0]
+
+    def get_queue(self):
+        """
+        Returns the Queue of closed bars
+        """
+        return self._queue
+
+    def get_bar(self, instrument, timeframe):
+        """
+        Copy of the in-progress bar of instrument and timeframe, or None
+        if no tick has been received for the instrument yet.
+        """
+        with self._lock:
+            bars = self._bars.get(instrument)
+            if bars is None:
+                return None
+            return self._record(bars[self._timeframes.index(timeframe)])
+
+    def subscribe_events(self, manager):
+        """
+        Subscribes this class to receive Offers updates.
+        """
+        offers_table = manager.getTable(O2GTable.Offers)
+        offers_table.__class__ = IO2GOffersTable
+        offers_table.subscribeUpdate(O2GTableUpdateType.Update, self)
+
+    def unsubscribe_events(self, manager):
+        """
+        Unsubscribes this class from updates.
+        """
+        offers_table = manager.getTable(O2GTable.Offers)
+        offers_table.__class__ = IO2GOffersTable
+        offers_table.unsubscribeUpdate(O2GTableUpdateType.Update, self)
@@ -0,0 +1,113 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 James K Bowler, Data Centauri Ltd
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+from forexconnect import CTableListener
+from forexconnect import (
+    O2GTable,
+    IO2GOffersTable,
+    IO2GOfferRow,
+    O2GTableUpdateType
+)
+
+from . import Counter
+
+from ..logger import Log
+log = Log().logger
+
+
+class OffersListener(CTableListener):
+    """
+    Passes the Offers table notifications on to an OffersTable, so it can
+    keep its index of the table and its quote cache current.
+    """
+    def __init__(self, offers_table):
+        super().__init__()
+        log.debug("")
+        self._refcount = Counter(1)
+        self._offers_table = offers_table
+
+    # C++ CallBack
+    def addRef(self):
+        self._refcount.increment()
+        ref = self._refcount.value
+        return ref
+
+    # C++ CallBack
+    def release(self):
+        self._refcount.decrement()
+        ref = self._refcount.value
+        if self._refcount.value == 0:
+            del self
+        return ref
+
+    # C++ CallBack
+    def _on_added(self, rowID, row):
+        row.__class__ = IO2GOfferRow
+        self._offers_table._on_offer_added(row)
+
+    # C++ CallBack
+    def _on_changed(self, rowID, row):
+        row.__class__ = IO2GOfferRow
+        self._offers_table._on_offer_changed(row)
+
+    # C++ CallBack
+    def _on_deleted(self, rowID, row):
+        row.__class__ = IO2GOfferRow
+        self._offers_table._on_offer_deleted(row)
+
+    # C++ CallBack
+    def _on_status_changed(self, status):
+        pass
+
+    def subscribe_events(self, manager):
+        """
+        Subscribes this class to receive Offers inserts and deletes.
+        """
+        offers_table = manager.getTable(O2GTable.Offers)
+        offers_table.__class__ = IO2GOffersTable
+        offers_table.subscribeUpdate(O2GTableUpdateType.Insert, self)
+        offers_table.subscribeUpdate(O2GTableUpdateType.Delete, self)
+
+    def unsubscribe_events(self, manager):
+        """
+        Unsubscribes this class from updates.
+        """
+        offers_table = manager.getTable(O2GTable.Offers)
+        offers_table.__class__ = IO2GOffersTable
+        offers_table.unsubscribeUpdate(O2GTableUpdateType.Insert, self)
+        offers_table.unsubscribeUpdate(O2GTableUpdateType.Delete, self)
+
+    def subscribe_updates(self, manager):
+        """
+        Subscribes this class to receive Offers price updates.
+        """
+        offers_table = manager.getTable(O2GTable.Offers)
+        offers_table.__class__ = IO2GOffersTable
+        offers_table.subscribeUpdate(O2GTableUpdateType.Update, self)
+
+    def unsubscribe_updates(self, manager):
+        """
+        Unsubscribes this class from price updates.
+        """
+        offers_table = manager.getTable(O2GTable.Offers)
+        offers_table.__class__ = IO2GOffersTable
+        offers_table.unsubscribeUpdate(O2GTableUpdateType.Update, self)
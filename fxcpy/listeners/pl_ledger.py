@@ -0,0 +1,183 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 James K Bowler, Data Centauri Ltd
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+from fxcpy.factory.resample import period_starts
+from fxcpy.utils.date_utils import to_ole, fm_ole, fm_ole_array
+
+from datetime import datetime
+from threading import Lock
+import numpy as np
+
+from ..logger import Log
+log = Log().logger
+
+# Totals of each bucket, in this order
+TOTALS = ('trades', 'amount', 'gross_pl', 'commission', 'rollover_interest')
+
+
+class PLLedger(object):
+    """
+    Running totals of the realised P/L of the current trading day, from
+    the ClosedTrades rows.
+
+    It is seeded with the closed trades loaded at login and each
+    ClosedTrades insert adds one trade in constant time, so the totals
+    can be polled without reading the table. Totals are kept for the
+    day, for each offer_id, for each side (the "B" or "S" the trade was
+    opened with) and for each hour of the close time.
+
+    The totals start again once the trading day is over, when a closed
+    trade of a later day arrives or when they are read after the end of
+    the day. Trades of an earlier day are ignored.
+    """
+    def __init__(self, trading_day=True):
+        log.debug("")
+        self._lock = Lock()
+        self._trading_day = trading_day
+        # OLE dates the current trading day starts and ends
+        self._day_start = None
+        self._day_end = None
+        self._reset()
+
+    def _reset(self):
+        self._trade_ids = set()
+        self._total = [0] * len(TOTALS)
+        self._instruments = {}
+        self._sides = {}
+        self._hours = {}
+
+    def _trading_day_start(self, oletime):
+        date = fm_ole_array([oletime], 's')
+        start = period_starts(date, 'D1', self._trading_day)
+        return float((start[0] - date[0]) / np.timedelta64(1, 'D')) + oletime
+
+    def _roll(self, oletime):
+        """
+        Moves the totals to the trading day of oletime when it is past the
+        end of the current day, called with the lock held.
+        """
+        if self._day_end is not None and oletime < self._day_end:
+            return
+        start = self._trading_day_start(oletime)
+        if self._day_start is not None:
+            log.debug("New trading day")
+            self._reset()
+        self._day_start = start
+        # Trading days last 23 to 25 hours, so a day and a bit after the
+        # start always falls in the next one
+        self._day_end = self._trading_day_start(start + 1.1)
+
+    def _roll_to_now(self):
+        if self._day_end is not None:
+            self._roll(to_ole(datetime.utcnow()))
+
+    @staticmethod
+    def _add_to(buckets, key, values):
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = list(values)
+        else:
+            for i, value in enumerate(values):
+                bucket[i] += value
+
+    def add(self, row):
+        """
+        Adds an IO2GClosedTradeRow, a trade already added is skipped.
+        """
+        trade_id = row.getTradeID()
+        close_time = row.getCloseTime()
+        values = (
+            1, row.getAmount(), row.getGrossPL(), row.getCommission(),
+            row.getRolloverInterest()
+        )
+        with self._lock:
+            self._roll(close_time)
+            if close_time < self._day_start or trade_id in self._trade_ids:
+                return
+            self._trade_ids.add(trade_id)
+            for i, value in enumerate(values):
+                self._total[i] += value
+            self._add_to(self._instruments, row.getOfferID(), values)
+            self._add_to(self._sides, row.getBuySell(), values)
+            hour = int(close_time * 24 + 1e-9)
+            self._add_to(self._hours, hour, values)
+
+    @staticmethod
+    def _as_dict(values):
+        return dict(zip(TOTALS, values))
+
+    def get_trading_day(self):
+        """
+        Start of the trading day the totals are for, or None before the
+        first closed trade.
+
+        Returns: datetime
+        """
+        with self._lock:
+            self._roll_to_now()
+            if self._day_start is not None:
+                return fm_ole(self._day_start)
+
+    def get_totals(self):
+        """
+        Totals of every closed trade of the day.
+
+        Returns: dict of trades, amount, gross_pl, commission and
+        rollover_interest
+        """
+        with self._lock:
+            self._roll_to_now()
+            return self._as_dict(self._total)
+
+    def get_totals_by_instrument(self):
+        """
+        Returns: dict of offer_id: dict of totals, see get_totals()
+        """
+        with self._lock:
+            self._roll_to_now()
+            return dict(
+                (offer_id, self._as_dict(values))
+                for offer_id, values in self._instruments.items()
+            )
+
+    def get_totals_by_side(self):
+        """
+        Returns: dict of "B" and "S": dict of totals, see get_totals()
+        """
+        with self._lock:
+            self._roll_to_now()
+            return dict(
+                (side, self._as_dict(values))
+                for side, values in self._sides.items()
+            )
+
+    def get_totals_by_hour(self):
+        """
+        Returns: dict of the start of the hour as a datetime: dict of
+        totals, see get_totals()
+        """
+        with self._lock:
+            self._roll_to_now()
+            return dict(
+                (fm_ole(hour / 24.0), self._as_dict(values))
+                for hour, values in sorted(self._hours.items())
+            )
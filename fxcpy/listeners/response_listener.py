@@ -55,12 +55,128 @@ from forexconnect import (
 )
 
 from eventfd import EventFD
+from collections import OrderedDict
+from threading import Lock
+import asyncio
+import time
 from . import Counter
 
 from ..logger import Log
 log = Log().logger
 
 
+class RequestHandle(object):
+    """
+    Completion handle for a single request sent to the trading server.
+
+    A handle is created with ResponseListener.register_request() before
+    the request is sent, the response or error for that request_id is
+    then routed to this handle only, so many requests can be in flight
+    at the same time without overwriting each other.
+    """
+    def __init__(self, request_id, shared=False):
+        self.request_id = request_id
+        # Responses and failures are also reported through the
+        # ResponseListener
+        self.shared = shared
+        self._event = EventFD()
+        self._response = None
+        self._error = None
+        self._was_error = False
+        # time.time() the response or error arrived
+        self.done_at = None
+
+    def __del__(self):
+        self.close()
+
+    def _on_completed(self, response):
+        """
+        Called by the ResponseListener when the request completed.
+        """
+        response.addRef()
+        self._response = response
+        self._was_error = False
+        self.done_at = time.time()
+        self._event.set()
+
+    def _on_failed(self, error):
+        """
+        Called by the ResponseListener when the request failed.
+        """
+        self._error = error
+        self._was_error = True
+        self.done_at = time.time()
+        self._event.set()
+
+    def get_response(self):
+        """
+        Get the response retrived for this request
+        """
+        return self._response
+
+    def get_error(self):
+        """
+        Get the error retrived for this request
+        """
+        return self._error
+
+    def has_error(self):
+        """
+        Bool true or false
+        """
+        return self._was_error
+
+    def is_done(self):
+        """
+        True once a response or an error has been received.
+        """
+        return self._event.is_set()
+
+    def fileno(self):
+        """
+        File descriptor that becomes readable once the request is done.
+        """
+        return self._event.fileno()
+
+    def wait(self, timeout=10):
+        """
+        Blocks until this request has completed or failed.
+        """
+        return self._event.wait(timeout=timeout)
+
+    async def wait_async(self, timeout=10):
+        """
+        Same as wait() for asyncio, the running event loop watches
+        fileno() so no thread is blocked while waiting.
+
+        Returns : bool False on timeout
+        """
+        if self.is_done():
+            return True
+        loop = asyncio.get_event_loop()
+        done = loop.create_future()
+
+        def on_readable():
+            if not done.done():
+                done.set_result(True)
+
+        loop.add_reader(self.fileno(), on_readable)
+        try:
+            return await asyncio.wait_for(done, timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            loop.remove_reader(self.fileno())
+
+    def close(self):
+        """
+        Release the response held by this handle.
+        """
+        if self._response:
+            self._response.release()
+        self._response = None
+
+
 class ResponseListener(CResponseListener):
     """
     The class provides method signatures to process notifications about request
@@ -82,6 +198,10 @@ class ResponseListener(CResponseListener):
     To process these notifications, you must use the onTablesUpdates method.
   
     """
+    # Seconds an unregistered request ID is remembered for dropping its
+    # late response, the server may never answer
+    drop_seconds = 600
+
     def __init__(self, session):
         super().__init__()
         log.debug("")
@@ -95,6 +215,11 @@ class ResponseListener(CResponseListener):
         self._response = None
         self._error = None
         self._was_error = False
+        self._handles = {}
+        self._handles_lock = Lock()
+        # time.time() request IDs were no longer waited for by request ID,
+        # oldest first, their late responses are dropped
+        self._dropped = OrderedDict()
 
     def __del__(self):
         #log.debug("")
@@ -137,6 +262,16 @@ class ResponseListener(CResponseListener):
         """
         response_type = response.getType()
         if self._init_completed:
+            handle = self._pop_handle(request_id)
+            if handle is not None:
+                handle._on_completed(response)
+                if not handle.shared:
+                    log.debug("{} {}".format(response_type.name, request_id))
+                    return
+            elif self._drop(request_id):
+                log.debug("Dropped {} {}".format(
+                    response_type.name, request_id))
+                return
             self._response = response
             self._response.addRef()
             self._was_error = False
@@ -258,6 +393,13 @@ class ResponseListener(CResponseListener):
         Request failed execution data handler.
         """
         log.error("Request {} : Reason {}".format(request_id, error))
+        handle = self._pop_handle(request_id)
+        if handle is not None:
+            handle._on_failed(error)
+            if not handle.shared:
+                return
+        elif self._drop(request_id):
+            return
         self._error = error
         self._was_error = True
         self.stop_waiting()
@@ -310,6 +452,57 @@ class ResponseListener(CResponseListener):
             else:
                 log.error("factory not found!")
 
+    def _pop_handle(self, request_id):
+        with self._handles_lock:
+            return self._handles.pop(request_id, None)
+
+    def _drop(self, request_id):
+        """
+        True if request_id was unregistered, its response is then
+        forgotten instead of waking the wait_events() callers.
+        """
+        with self._handles_lock:
+            if self._dropped.pop(request_id, None) is not None:
+                return True
+        return False
+
+    def register_request(self, request_id, shared=False):
+        """
+        Routes the response of request_id to its own RequestHandle
+        instead of the shared last response slot.
+
+        Must be called before the request is sent to the trading server.
+
+        Optional :
+            > bool also report the response through get_response(), or
+              the failure through has_error() and get_error(), and wake
+              wait_events(), for callers waiting on the listener
+
+        Returns: RequestHandle
+        """
+        handle = RequestHandle(request_id, shared)
+        with self._handles_lock:
+            self._handles[request_id] = handle
+        return handle
+
+    def unregister_request(self, request_id):
+        """
+        Stop waiting for request_id, e.g. after a timeout. A response
+        arriving within drop_seconds is dropped.
+        """
+        now = time.time()
+        with self._handles_lock:
+            handle = self._handles.pop(request_id, None)
+            if handle is not None:
+                self._dropped[request_id] = now
+            while self._dropped:
+                oldest = next(iter(self._dropped))
+                if now - self._dropped[oldest] < self.drop_seconds:
+                    break
+                del self._dropped[oldest]
+        if handle is not None:
+            handle.close()
+
     def clear_last_responce(self):
         if self._response:
             self._response.release()
@@ -47,6 +47,7 @@ from forexconnect import (
 from fxcpy.utils.print_order import print_order_monitor
 
 from .order_monitor import OrderMonitor
+from .pl_ledger import PLLedger
 
 from eventfd import EventFD
 from . import Counter
@@ -68,6 +69,7 @@ class TableListener(CTableListener):
         self._response_listener = response_listener
         self._response_listener.addRef()
         self._order_monitor = OrderMonitor()
+        self._pl_ledger = PLLedger()
         self._event = EventFD()
         self._init_setup()
 
@@ -106,6 +108,7 @@ class TableListener(CTableListener):
             row.release()
             
         for row in self._response_listener._init['closed_trades']:
+            self._pl_ledger.add(row)
             trade_id = row.getTradeID()
             if trade_id in bom.get_monitors():
                 bom.get_monitors()[trade_id]._closed_trades.append(row)
@@ -170,6 +173,7 @@ class TableListener(CTableListener):
                 row.getAmount()
                 )
             )
+            self._pl_ledger.add(row)
             self._order_monitor._on_closed_trade_added(row)
             trade_id = row.getTradeID()
             if self._order_monitor.is_executed(trade_id):
@@ -139,7 +139,8 @@ class SessionHandler(object):
             self._trading_commands = TradingCommands(
                 self._session,
                 self.account_id,
-                offer_attribs
+                offer_attribs,
+                self.response_listener
             )
             
             # Market Data
@@ -252,6 +253,15 @@ class SessionHandler(object):
         else:
             return None
         
+    def get_pl_ledger(self):
+        """
+        Return the PLLedger of the realised P/L of the trading day
+        """
+        if self.table_manager_loaded:
+            return self._table_listener._pl_ledger
+        else:
+            return None
+        
     def get_trade_settings_provider(self):
         """
         Return the TradingSettingProvider
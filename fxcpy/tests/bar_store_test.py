@@ -0,0 +1,88 @@
+from forexconnect import O2GCandleOpenPriceMode
+
+from fxcpy.factory.bar_store import BarStore
+from fxcpy.factory.resample import BAR_DTYPE
+from fxcpy.tests.stand_ins import (
+    TIMEFRAMES, check, stand_in_market_data, synthetic_series
+)
+from fxcpy.utils.date_utils import to_ole_array
+
+import numpy as np
+import tempfile
+
+# Offline checks of the BarStore, and of MarketData.get_price_data
+# reading it before requesting bars from the stand-in session.
+#
+#   python fxcpy/tests/bar_store_test.py
+
+MINUTE = TIMEFRAMES['m1'].days
+SERIES = {'m1': synthetic_series('m1', 3000)}
+FIRST = SERIES['m1']['date'][0]
+store = BarStore(tempfile.mkdtemp(), BAR_DTYPE)
+market_data, session = stand_in_market_data(SERIES, bar_store=store)
+
+
+def get_bars(dtFrom, dtTo, **kwargs):
+    del session.sent[:]
+    a = np.concatenate(list(market_data.get_price_data(
+        "GBP/USD", "m1", dtFrom, dtTo, **kwargs)))
+    # Pages share the bar on their edge
+    return a[np.unique(a['date'], return_index=True)[1]]
+
+
+def expected(dtFrom, dtTo):
+    rows = SERIES['m1'][
+        (SERIES['m1']['date'] >= dtFrom - 1e-9) &
+        (SERIES['m1']['date'] <= dtTo + 1e-9)
+    ]
+    return rows['bidclose']
+
+
+lo, hi = FIRST + 1000 * MINUTE, FIRST + 1999 * MINUTE
+bars = get_bars(lo, hi)
+check(
+    "get_price_data stores the bars it requests",
+    bars['bidclose'].tolist() == expected(lo, hi).tolist() and
+    len(store.load("GBP/USD", "m1")) == 1000
+)
+bars = get_bars(lo, hi)
+check(
+    "A stored range is not requested again",
+    session.sent == [] and
+    bars['bidclose'].tolist() == expected(lo, hi).tolist()
+)
+bars = get_bars(FIRST, FIRST + 2999 * MINUTE)
+check(
+    "Only the gaps around a stored range are requested",
+    bars['bidclose'].tolist() == SERIES['m1']['bidclose'].tolist() and
+    len(session.sent) > 0 and all(
+        dtTo <= lo or dtFrom >= hi for name, dtFrom, dtTo in session.sent)
+)
+bars = get_bars(lo, hi, PriceMode=O2GCandleOpenPriceMode.FirstTick)
+check("FirstTick bars are not read from the store", len(session.sent) > 0)
+bars = get_bars(lo, hi, incWeekendData=True)
+check(
+    "Bars with weekend data are not read from the store",
+    len(session.sent) > 0
+)
+
+store = BarStore(tempfile.mkdtemp(), BAR_DTYPE)
+market_data, session = stand_in_market_data(SERIES, bar_store=store)
+first_tick = O2GCandleOpenPriceMode.FirstTick
+market_data.sync_tail("GBP/USD", "m1", FIRST, first_tick)
+check(
+    "sync_tail keeps FirstTick bars out of the store",
+    len(market_data.get_tail("GBP/USD", "m1", first_tick)) == 3000 and
+    len(store.load("GBP/USD", "m1")) == 0
+)
+
+legacy = BarStore(tempfile.mkdtemp(), BAR_DTYPE)
+rows = np.zeros(6, dtype=BAR_DTYPE)
+rows['date'] = np.datetime64('2018-06-12T00:00') + \
+    np.array([0, 1, 2, 10, 11, 12]).astype('timedelta64[m]')
+legacy.write("GBP/USD", "m1", rows)
+check(
+    "A store without coverage is not trusted across holes",
+    legacy.get_coverage("GBP/USD", "m1").get_intervals().tolist() ==
+    to_ole_array(rows['date'][[0, 2, 3, 4]]).reshape(2, 2).tolist()
+)
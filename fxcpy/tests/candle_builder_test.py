@@ -0,0 +1,55 @@
+from fxcpy.factory.resample import TICK_DTYPE, resample
+from fxcpy.listeners.candle_builder import CandleBuilder
+from fxcpy.tests.stand_ins import check
+from fxcpy.utils.date_utils import to_ole_array
+
+import numpy as np
+
+# Offline checks of CandleBuilder, the bars built from live ticks are
+# the bars resample() builds from the same ticks.
+#
+#   python fxcpy/tests/candle_builder_test.py
+
+TIMEFRAMES = ['m1', 'm5', 'H1', 'D1', 'W1']
+
+# About a week of ticks, New York clocks go forward on 2018-03-11
+rng = np.random.RandomState(0)
+ticks = np.zeros(20000, dtype=TICK_DTYPE)
+ticks['date'] = np.datetime64('2018-03-08T00:00:00', 'ms') + np.cumsum(
+    rng.randint(0, 60, len(ticks))).astype('timedelta64[s]')
+ticks['bid'] = np.round(
+    1.3 + np.cumsum(rng.normal(0, 0.00001, len(ticks))), 5)
+ticks['ask'] = np.round(ticks['bid'] + 0.0002, 5)
+
+candle_builder = CandleBuilder(TIMEFRAMES)
+check(
+    "get_bar is None before the first tick",
+    candle_builder.get_bar('GBP/USD', 'm1') is None
+)
+for date, bid, ask in zip(
+    to_ole_array(ticks['date']).tolist(), ticks['bid'].tolist(),
+    ticks['ask'].tolist()
+):
+    candle_builder.on_tick('GBP/USD', date, bid, ask)
+
+closed = dict((timeframe, []) for timeframe in TIMEFRAMES)
+queue = candle_builder.get_queue()
+while not queue.empty():
+    instrument, timeframe, bar = queue.get()
+    closed[timeframe].append(bar)
+for timeframe in TIMEFRAMES:
+    expected = resample(ticks, timeframe)
+    bars = np.array(closed[timeframe], dtype=expected.dtype)
+    check(
+        "{} bars are the resampled ticks".format(timeframe),
+        (bars == expected[:-1]).all() and
+        candle_builder.get_bar('GBP/USD', timeframe) == expected[-1]
+    )
+
+last = candle_builder.get_bar('GBP/USD', 'H1')
+candle_builder.on_tick(
+    'GBP/USD', to_ole_array(ticks['date'][:1])[0] - 1.0, 1.0, 1.0)
+check(
+    "A tick of a closed period is ignored",
+    queue.empty() and candle_builder.get_bar('GBP/USD', 'H1') == last
+)
@@ -0,0 +1,41 @@
+from fxcpy.factory.coverage import Coverage
+from fxcpy.tests.stand_ins import check
+
+# Offline checks of Coverage, the ranges of a series already requested.
+#
+#   python fxcpy/tests/coverage_test.py
+
+coverage = Coverage([(1.0, 2.0), (5.0, 6.0)])
+coverage.add(3.0, 4.0)
+check("Coverage.add keeps separate ranges apart", len(coverage) == 3)
+coverage.add(2.0, 3.0)
+check(
+    "Coverage.add merges touching ranges",
+    coverage.get_intervals().tolist() == [[1.0, 4.0], [5.0, 6.0]]
+)
+coverage.add(0.5, 7.0)
+check(
+    "Coverage.add merges overlapped ranges",
+    coverage.get_intervals().tolist() == [[0.5, 7.0]]
+)
+coverage.add(8.0, 7.5)
+check("Coverage.add ignores an empty range", len(coverage) == 1)
+
+coverage = Coverage([(1.0, 2.0), (3.0, 4.0)])
+check(
+    "Coverage.split returns the parts newest first",
+    coverage.split(0.0, 5.0) == [
+        (4.0, 5.0, False), (3.0, 4.0, True), (2.0, 3.0, False),
+        (1.0, 2.0, True), (0.0, 1.0, False)
+    ]
+)
+check(
+    "Coverage.split clips the ranges to the dates asked",
+    coverage.split(1.5, 3.5) == [
+        (3.0, 3.5, True), (2.0, 3.0, False), (1.5, 2.0, True)
+    ]
+)
+check(
+    "Coverage.gaps skips gaps shorter than min_gap",
+    coverage.gaps(1.0, 2.0 + Coverage.min_gap / 2) == []
+)
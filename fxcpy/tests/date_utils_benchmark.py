@@ -0,0 +1,30 @@
+from fxcpy.utils.date_utils import (
+    to_ole, fm_ole, to_ole_array, fm_ole_array
+)
+
+from datetime import datetime
+import numpy as np
+import time
+
+N = 1000000
+
+# One million minutely OLE dates from 2018-01-01
+start = to_ole(datetime(2018, 1, 1))
+ole = start + np.arange(N, dtype=np.float64) / 1440.0
+
+t = time.time()
+scalar = np.array([fm_ole(float(x)) for x in ole], dtype='datetime64[s]')
+scalar_secs = time.time() - t
+
+t = time.time()
+vector = fm_ole_array(ole)
+vector_secs = time.time() - t
+
+t = time.time()
+back = to_ole_array(vector)
+to_ole_secs = time.time() - t
+
+print("fm_ole        {:>12,.0f} dates/sec".format(N / scalar_secs))
+print("fm_ole_array  {:>12,.0f} dates/sec".format(N / vector_secs))
+print("to_ole_array  {:>12,.0f} dates/sec".format(N / to_ole_secs))
+print("max round trip error {:.3e} days".format(np.abs(back - ole).max()))
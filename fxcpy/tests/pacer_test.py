@@ -0,0 +1,47 @@
+from fxcpy.factory.pacer import Pacer
+from fxcpy.tests.stand_ins import check
+
+# Offline checks of the Pacer, the retry and pacing policy of history
+# requests.
+#
+#   python fxcpy/tests/pacer_test.py
+
+pacer = Pacer(backoff=1.0, max_backoff=5.0)
+check(
+    "Pacer backoff doubles with each attempt up to max_backoff",
+    [pacer.get_backoff(attempt) for attempt in range(1, 5)] ==
+    [1.0, 2.0, 4.0, 5.0]
+)
+
+pacer = Pacer()
+for elapsed in (0.1, 0.1, 0.1):
+    pacer.on_response(elapsed)
+check(
+    "Steady responses are not paced",
+    pacer.get_delay() == 0.0 and pacer.get_limit(8) == 8
+)
+for i in range(10):
+    pacer.on_response(1.0)
+check(
+    "Slow responses pause requests and lower the limit",
+    0.0 < pacer.get_delay() <= pacer.max_delay and pacer.get_limit(8) < 8
+)
+for i in range(50):
+    pacer.on_response(0.1)
+check(
+    "Pacing recovers once responses speed up",
+    pacer.get_delay() == 0.0 and pacer.get_limit(8) == 8
+)
+
+pacer = Pacer(max_delay=1.0)
+pacer.on_timeout()
+check(
+    "A timeout halves the requests in flight",
+    pacer.get_delay() > 0.0 and pacer.get_limit(8) == 4
+)
+for i in range(10):
+    pacer.on_timeout()
+check(
+    "Timeouts keep one request in flight, paused up to max_delay",
+    pacer.get_delay() == 1.0 and pacer.get_limit(8) == 1
+)
@@ -0,0 +1,102 @@
+from fxcpy.listeners import pl_ledger
+from fxcpy.tests.stand_ins import check
+from fxcpy.utils.date_utils import to_ole
+
+from datetime import datetime
+
+# Offline checks of PLLedger, with a stand-in clock.
+#
+#   python fxcpy/tests/pl_ledger_test.py
+
+
+class Clock(datetime):
+    now = datetime(2018, 6, 12, 12, 0)
+
+    @classmethod
+    def utcnow(cls):
+        return cls.now
+
+
+class StandInClosedTrade(object):
+    def __init__(self, trade_id, close_time, side="B", gross_pl=1.0):
+        self.trade_id = trade_id
+        self.close_time = to_ole(close_time)
+        self.side = side
+        self.gross_pl = gross_pl
+
+    def getTradeID(self):
+        return self.trade_id
+
+    def getCloseTime(self):
+        return self.close_time
+
+    def getOfferID(self):
+        return "1"
+
+    def getBuySell(self):
+        return self.side
+
+    def getAmount(self):
+        return 1000
+
+    def getGrossPL(self):
+        return self.gross_pl
+
+    def getCommission(self):
+        return 0.0
+
+    def getRolloverInterest(self):
+        return 0.0
+
+
+pl_ledger.datetime = Clock
+ledger = pl_ledger.PLLedger()
+ledger.add(StandInClosedTrade("1", datetime(2018, 6, 12, 10, 0)))
+ledger.add(StandInClosedTrade("1", datetime(2018, 6, 12, 10, 0)))
+ledger.add(StandInClosedTrade("2", datetime(2018, 6, 12, 20, 59), "S", -3.0))
+check(
+    "PLLedger counts each closed trade once",
+    ledger.get_totals()['trades'] == 2 and
+    ledger.get_totals()['gross_pl'] == -2.0 and
+    ledger.get_trading_day() == datetime(2018, 6, 11, 21, 0)
+)
+check(
+    "PLLedger totals by side and hour",
+    ledger.get_totals_by_side()['S']['gross_pl'] == -3.0 and
+    list(ledger.get_totals_by_hour()) == [
+        datetime(2018, 6, 12, 10, 0), datetime(2018, 6, 12, 20, 0)]
+)
+ledger.add(StandInClosedTrade("3", datetime(2018, 6, 12, 21, 0)))
+check(
+    "PLLedger starts again on a later trading day",
+    ledger.get_totals()['trades'] == 1 and
+    ledger.get_trading_day() == datetime(2018, 6, 12, 21, 0)
+)
+ledger.add(StandInClosedTrade("4", datetime(2018, 6, 12, 11, 0)))
+check(
+    "PLLedger ignores trades of an earlier day",
+    ledger.get_totals()['trades'] == 1
+)
+Clock.now = datetime(2018, 6, 13, 20, 59)
+check(
+    "PLLedger keeps the day until it ends",
+    ledger.get_totals()['trades'] == 1
+)
+Clock.now = datetime(2018, 6, 13, 21, 0)
+check(
+    "PLLedger starts again when the day is over",
+    ledger.get_totals()['trades'] == 0 and
+    ledger.get_totals_by_hour() == {} and
+    ledger.get_trading_day() == datetime(2018, 6, 13, 21, 0)
+)
+
+# New York clocks go back on 2018-11-04, that trading day is 25 hours long
+ledger = pl_ledger.PLLedger()
+Clock.now = datetime(2018, 11, 4, 12, 0)
+ledger.add(StandInClosedTrade("1", datetime(2018, 11, 3, 23, 0)))
+ledger.add(StandInClosedTrade("2", datetime(2018, 11, 4, 21, 30)))
+check(
+    "PLLedger keeps a 25 hour trading day whole",
+    ledger.get_totals()['trades'] == 2 and
+    ledger.get_trading_day() == datetime(2018, 11, 3, 21, 0)
+)
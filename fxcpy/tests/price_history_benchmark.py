@@ -0,0 +1,95 @@
+from fxcpy.chart.basic_chart import BasicChart
+from fxcpy.tests.stand_ins import (
+    DEPTH, stand_in_market_data, synthetic_series
+)
+from fxcpy.utils.date_utils import fm_ole
+
+import numpy as np
+import sys
+import time
+import tracemalloc
+
+# Runs the price history path against stand-in session and reader
+# objects serving N synthetic rows, no FXCM login is needed.
+#
+#   python fxcpy/tests/price_history_benchmark.py [N]
+
+N = 1000000
+if len(sys.argv) > 1:
+    N = int(sys.argv[1])
+
+
+def run(stage, rows, func):
+    """
+    Times func, split into the stand-in server, reading snapshots and
+    the rest, then runs it again to measure the peak memory it
+    allocates, as tracing every allocation slows it down.
+    """
+    del session.sent[:]
+    session.seconds = read_seconds[0] = 0.0
+    t = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - t
+    sent, server, read = len(session.sent), session.seconds, read_seconds[0]
+    del result
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print("{:<24} {:>9.3f} s {:>14,.0f} rows/sec {:>10.1f} MB peak".format(
+        stage, seconds, rows / seconds, peak / 1e6))
+    if sent:
+        print("    {:,} requests: server {:.3f} s, read {:.3f} s, "
+              "rest {:.3f} s".format(
+                  sent, server, read, seconds - server - read))
+    return result
+
+
+SERIES = {
+    'm1': synthetic_series('m1', N),
+    't1': synthetic_series('t1', N)
+}
+market_data, session = stand_in_market_data(SERIES)
+
+# Time spent reading snapshots, out of the whole walk
+read_seconds = [0.0]
+read_snapshot = market_data._read_snapshot
+
+
+def timed_read_snapshot(*args, **kwargs):
+    t = time.perf_counter()
+    data = read_snapshot(*args, **kwargs)
+    read_seconds[0] += time.perf_counter() - t
+    return data
+
+
+market_data._read_snapshot = timed_read_snapshot
+
+print("{:,} rows, {} rows per page".format(N, DEPTH))
+for timeframe in ('m1', 't1'):
+    dates = SERIES[timeframe]['date']
+    dtFrom, dtTo = dates[0], dates[-1]
+    pages = run(
+        "get_price_data " + timeframe, N,
+        lambda: list(market_data.get_price_data(
+            "GBP/USD", timeframe, dtFrom, dtTo))
+    )
+    if timeframe == 'm1':
+        bars = np.concatenate(pages)
+        run("check_bars", len(bars), lambda: market_data.check_bars(bars))
+        del bars
+    del pages
+    run(
+        "get_price_columns " + timeframe, N,
+        lambda: market_data.get_price_columns(
+            "GBP/USD", timeframe, dtFrom, dtTo)
+    )
+
+# BasicChart converts the datetimes back to OLE dates
+dates = SERIES['m1']['date']
+chart = BasicChart(market_data)
+run(
+    "BasicChart price action", N,
+    lambda: chart._get_price_action(
+        "GBP/USD", "m1", fm_ole(dates[0]), fm_ole(dates[-1]))
+)
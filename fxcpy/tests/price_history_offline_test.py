@@ -0,0 +1,326 @@
+from fxcpy.exception import RequestFailedError, RequestTimeOutError
+from fxcpy.factory import price_history
+from fxcpy.factory.bar_store import BarStore
+from fxcpy.factory.pacer import Pacer
+from fxcpy.factory.resample import BAR_DTYPE
+from fxcpy.tests.stand_ins import (
+    TIMEFRAMES, check, raises, stand_in_market_data, synthetic_series
+)
+from fxcpy.utils.date_utils import fm_ole
+
+from datetime import datetime
+import asyncio
+import numpy as np
+import tempfile
+
+# Offline checks of the MarketData history walks, served by the
+# stand-in session of stand_ins.py.
+#
+#   python fxcpy/tests/price_history_offline_test.py
+
+SERIES = {
+    'H1': synthetic_series('H1', 3000),
+    'm1': synthetic_series('m1', 20000)
+}
+FIRST = SERIES['H1']['date'][0]
+LAST = SERIES['H1']['date'][-1]
+
+
+def bars(market_data, *args, **kwargs):
+    pages = list(market_data.get_price_data(*args, **kwargs))
+    if not pages:
+        return 0
+    return len(np.unique(np.concatenate(pages)['date']))
+
+
+# A page answered after its timeout is dropped, not taken for the
+# response of the next page
+market_data, session = stand_in_market_data(
+    SERIES, pacer=Pacer(timeout=0.05, backoff=0.01))
+session.late = {1: 3}
+check(
+    "A late response does not replace the next page",
+    bars(market_data, 'EUR/USD', 'H1', FIRST, LAST) == 3000
+)
+check("The late response is dropped", session.listener.dropped == 1)
+check(
+    "The timed out page is retried on a new request",
+    market_data.request_factory.created == 2
+)
+
+# A page that keeps timing out raises once out of retries, the walk is
+# resumed from the date it reached
+market_data, session = stand_in_market_data(
+    SERIES, pacer=Pacer(timeout=0.02, retries=2, backoff=0.01))
+session.late = {1: 99, 2: 99, 3: 99}
+error = raises(
+    RequestTimeOutError, bars, market_data, 'EUR/USD', 'H1', FIRST, LAST)
+check(
+    "RequestTimeOutError is raised after the retries",
+    error is not None and len(session.sent) == 4
+)
+check(
+    "RequestTimeOutError has the date the walk reached",
+    error.dtFirst == SERIES['H1']['date'][-300]
+)
+check(
+    "The walk resumes from dtFirst",
+    bars(market_data, 'EUR/USD', 'H1', FIRST, error.dtFirst) == 2701
+)
+
+# get_price_data_async walks on the event loop
+async def bars_async(market_data, *args, **kwargs):
+    pages = []
+    async for data in market_data.get_price_data_async(*args, **kwargs):
+        pages.append(data)
+    return len(np.unique(np.concatenate(pages)['date']))
+
+
+async def both(market_data):
+    return await asyncio.gather(
+        bars_async(market_data, 'EUR/USD', 'H1', FIRST, LAST),
+        bars_async(market_data, 'GBP/USD', 'H1', FIRST, LAST)
+    )
+
+
+loop = asyncio.new_event_loop()
+market_data, session = stand_in_market_data(SERIES)
+check(
+    "get_price_data_async walks series side by side",
+    loop.run_until_complete(both(market_data)) == [3000, 3000]
+)
+market_data, session = stand_in_market_data(
+    SERIES, pacer=Pacer(timeout=0.05, backoff=0.01))
+session.late = {1: 3}
+check(
+    "get_price_data_async retries a late page on a new request",
+    loop.run_until_complete(
+        bars_async(market_data, 'EUR/USD', 'H1', FIRST, LAST)) == 3000 and
+    session.listener.dropped == 1
+)
+loop.close()
+
+# A page failed by the server raises, and adds no coverage
+market_data, session = stand_in_market_data(SERIES)
+session.failed = {1}
+error = raises(
+    RequestFailedError, bars, market_data, 'EUR/USD', 'H1', FIRST, LAST)
+check("A failed page raises RequestFailedError", error is not None)
+check(
+    "RequestFailedError has the date the walk reached",
+    error.dtFirst == SERIES['H1']['date'][-300]
+)
+with tempfile.TemporaryDirectory() as path:
+    store = BarStore(path, BAR_DTYPE)
+    market_data, session = stand_in_market_data(SERIES, bar_store=store)
+    session.failed = {1}
+    raises(
+        RequestFailedError, bars, market_data, 'EUR/USD', 'H1', FIRST, LAST)
+    check(
+        "The pages before a failure are stored",
+        len(store.load('EUR/USD', 'H1')) == 300
+    )
+    check(
+        "A failed walk adds no coverage",
+        len(store.get_coverage('EUR/USD', 'H1').get_intervals()) == 0
+    )
+
+# get_price_data_many walks every series at once
+market_data, session = stand_in_market_data(SERIES)
+pages = list(market_data.get_price_data_many(
+    ['EUR/USD', 'GBP/USD'], ['H1', 'm1'], FIRST, LAST))
+series = {}
+for instrument, timeframe, data, elapsed in pages:
+    series.setdefault((instrument, timeframe), []).append(data)
+check(
+    "get_price_data_many returns every bar of every series",
+    sorted(
+        (key, len(np.unique(np.concatenate(data)['date'])))
+        for key, data in series.items()
+    ) == [
+        (('EUR/USD', 'H1'), 3000), (('EUR/USD', 'm1'), 20000),
+        (('GBP/USD', 'H1'), 3000), (('GBP/USD', 'm1'), 20000)
+    ]
+)
+check(
+    "get_price_data_many interleaves the series",
+    len(set((page[0], page[1]) for page in pages[:4])) == 4
+)
+check(
+    "Each series is returned newest page first",
+    all(
+        all(a['date'][0] >= b['date'][0] for a, b in zip(data, data[1:]))
+        for data in series.values()
+    )
+)
+# The first GBP/USD page is answered after its retry, while the second
+# one is in flight, sends 2 to 10 are the rest of EUR/USD
+market_data, session = stand_in_market_data(
+    SERIES, pacer=Pacer(timeout=0.2, backoff=0.01))
+session.late = {1: 12}
+pages = list(market_data.get_price_data_many(
+    ['EUR/USD', 'GBP/USD'], ['H1'], FIRST, LAST))
+check(
+    "get_price_data_many retries a late page on a new request",
+    len(np.unique(np.concatenate(
+        [page[2] for page in pages if page[0] == 'GBP/USD'])['date'])) ==
+    3000 and session.listener.dropped == 1
+)
+
+# plan_windows splits a range into pages requested side by side
+market_data, session = stand_in_market_data(SERIES)
+M_FIRST, M_LAST = SERIES['m1']['date'][0], SERIES['m1']['date'][-1]
+windows = market_data.plan_windows('m1', M_FIRST, M_LAST)
+check(
+    "plan_windows covers the range newest first without gaps",
+    windows[0][1] == M_LAST and windows[-1][0] == M_FIRST and all(
+        a[0] == b[1] for a, b in zip(windows, windows[1:]))
+)
+check(
+    "Each window fits in one page",
+    all(
+        round((dtTo - dtFrom) * 1440) < 300 for dtFrom, dtTo in windows)
+)
+check(
+    "plan_windows needs dtFrom",
+    raises(AttributeError, market_data.plan_windows, 'm1', 0.0, M_LAST)
+    is not None
+)
+check(
+    "plan_windows rejects tick data",
+    raises(AttributeError, market_data.plan_windows, 't1', M_FIRST, M_LAST)
+    is not None
+)
+data = market_data.get_price_data_parallel('EUR/USD', 'm1', M_FIRST, M_LAST)
+walked = np.concatenate(list(
+    market_data.get_price_data('EUR/USD', 'm1', M_FIRST, M_LAST)))
+check(
+    "get_price_data_parallel returns the bars of get_price_data",
+    (data == walked[np.unique(walked['date'], return_index=True)[1]]).all()
+)
+
+# Each window of a parallel download frees its request for the next one
+market_data, session = stand_in_market_data(SERIES)
+data = market_data.get_price_data_parallel(
+    'EUR/USD', 'm1', SERIES['m1']['date'][0], SERIES['m1']['date'][-1],
+    max_requests=4
+)
+check("get_price_data_parallel returns every bar", len(data) == 20000)
+check(
+    "Windows share the requests in flight",
+    len(session.sent) > 60 and market_data.request_factory.created <= 4
+)
+check(
+    "Finished windows give their request back",
+    len(market_data._requests[('EUR/USD', 'm1')]) ==
+    market_data.request_factory.created
+)
+requests = [market_data._create_request('EUR/USD', 'H1') for i in range(12)]
+for request in requests:
+    market_data._release_request('EUR/USD', 'H1', request)
+check(
+    "At most _free_requests are kept per series",
+    len(market_data._requests[('EUR/USD', 'H1')]) ==
+    market_data._free_requests
+)
+
+
+# sync_tail only requests the bars from the last one it has
+market_data, session = stand_in_market_data(dict(SERIES))
+data = market_data.sync_tail('EUR/USD', 'm1')
+check(
+    "sync_tail starts an empty series with the latest page",
+    len(data) == 300 and data['date'][-1] == fm_ole(M_LAST)
+)
+del session.sent[:]
+check(
+    "sync_tail returns nothing while the last bar is unchanged",
+    len(market_data.sync_tail('EUR/USD', 'm1')) == 0 and
+    len(session.sent) == 1
+)
+grown = np.concatenate([SERIES['m1'], SERIES['m1'][-100:]])
+grown['date'][-100:] += 100 * TIMEFRAMES['m1'].days
+grown['bidclose'][-101] += 0.001
+session.series['m1'] = grown
+data = market_data.sync_tail('EUR/USD', 'm1')
+check(
+    "sync_tail returns the updated last bar and the new bars",
+    len(data) == 101 and data['bidclose'][0] == grown['bidclose'][-101]
+)
+tail = market_data.get_tail('EUR/USD', 'm1')
+check(
+    "get_tail holds the series with the updated last bar",
+    len(tail) == 400 and (tail[-101:] == data).all()
+)
+with tempfile.TemporaryDirectory() as path:
+    store = BarStore(path, BAR_DTYPE)
+    market_data, session = stand_in_market_data(SERIES, bar_store=store)
+    market_data.sync_tail('EUR/USD', 'H1', since=FIRST)
+    check(
+        "sync_tail keeps the series in the BarStore when set",
+        len(store.load('EUR/USD', 'H1')) == 3000 and
+        len(market_data.get_tail('EUR/USD', 'H1')) == 3000
+    )
+check(
+    "sync_tail rejects tick data",
+    raises(AttributeError, market_data.sync_tail, 'EUR/USD', 't1')
+    is not None
+)
+
+# check_bars drops invalid bars and reports them
+market_data, session = stand_in_market_data(SERIES)
+page = next(market_data.get_price_data('EUR/USD', 'H1', FIRST, LAST))
+page['askhigh'][5] = page['asklow'][5] - 0.001
+page['volume'][10] = -1
+repeat = page[20:21].copy()
+repeat['volume'] += 1
+data, report = market_data.check_bars(
+    np.concatenate([page, repeat]), report=True)
+check(
+    "check_bars drops invalid bars and keeps one bar per date",
+    len(data) == 298 and len(np.unique(data['date'])) == 298
+)
+check(
+    "check_bars returns the bars newest first",
+    (np.diff(data['date'].astype(np.int64)) < 0).all()
+)
+check(
+    "check_bars keeps the last bar of a date",
+    data[data['date'] == repeat['date'][0]]['volume'][0] ==
+    repeat['volume'][0]
+)
+check(
+    "check_bars reports the bars failing each rule",
+    report['askhigh >= asklow'] == 1 and report['volume >= 0'] == 1 and
+    report['bidhigh >= bidlow'] == 0 and
+    report['duplicates'].tolist() == [repeat['date'][0].item()]
+)
+check(
+    "check_bars rejects anything but a Numpy array",
+    raises(AttributeError, market_data.check_bars, list(page)) is not None
+)
+
+# The trading week is computed again when the next week starts, an hour
+# early after New York clocks go forward on 2018-03-11
+class Clock(datetime):
+    now = datetime(2018, 3, 7, 12, 0)
+
+    @classmethod
+    def utcnow(cls):
+        return cls.now
+
+
+price_history.datetime = Clock
+try:
+    market_data, session = stand_in_market_data(SERIES)
+    check(
+        "get_trading_week starts on Sunday at 17:00 New York time",
+        market_data.get_trading_week()[0] == datetime(2018, 3, 4, 22, 0)
+    )
+    Clock.now = datetime(2018, 3, 11, 21, 30)
+    check(
+        "get_trading_week moves on when the week starts an hour early",
+        market_data.get_trading_week()[0] == datetime(2018, 3, 11, 21, 0)
+    )
+finally:
+    price_history.datetime = datetime
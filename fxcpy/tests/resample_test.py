@@ -0,0 +1,62 @@
+from fxcpy.factory.resample import (
+    BAR_DTYPE, TICK_DTYPE, period_starts, resample
+)
+from fxcpy.tests.stand_ins import check
+
+import numpy as np
+
+# Offline checks of resample() and period_starts().
+#
+#   python fxcpy/tests/resample_test.py
+
+check(
+    "resample of no bars returns no bars",
+    resample(np.empty(0, BAR_DTYPE), "H1").dtype == BAR_DTYPE and
+    len(resample(np.empty(0, TICK_DTYPE), "D1")) == 0
+)
+
+# New York clocks go forward on 2018-03-11, the trading day starting on
+# the 10th at 22:00 UTC is 23 hours long and the next one starts at
+# 21:00 UTC
+ticks = np.zeros(4, dtype=TICK_DTYPE)
+ticks['date'] = np.array([
+    '2018-03-09T21:59:59', '2018-03-09T22:00:00',
+    '2018-03-11T20:59:59', '2018-03-11T21:00:00'
+], dtype='datetime64[ms]')
+ticks['bid'] = np.arange(4)
+ticks['ask'] = ticks['bid'] + 1
+bars = resample(ticks, "D1")
+check(
+    "resample follows the trading day across daylight saving",
+    bars['date'].astype(str).tolist() == [
+        '2018-03-08T22:00:00', '2018-03-09T22:00:00',
+        '2018-03-10T22:00:00', '2018-03-11T21:00:00'
+    ] and bars['volume'].tolist() == [1, 1, 1, 1]
+)
+check(
+    "period_starts of weeks start on Sunday evening",
+    str(period_starts(ticks['date'][3:], "W1")[0]) == '2018-03-11T21:00:00'
+)
+check(
+    "resample of UTC days starts at midnight",
+    resample(ticks, "D1", trading_day=False)['date'].astype(str).tolist()
+    == ['2018-03-09T00:00:00', '2018-03-11T00:00:00']
+)
+
+# Hourly bars to H4, the open of the first bar and the close of the last
+bars = np.zeros(8, dtype=BAR_DTYPE)
+bars['date'] = np.datetime64('2018-06-12T00:00') + \
+    np.arange(8).astype('timedelta64[h]')
+for side in ('ask', 'bid'):
+    bars[side + 'open'] = np.arange(8)
+    bars[side + 'close'] = np.arange(8) + 0.5
+    bars[side + 'high'] = np.arange(8) + 1
+    bars[side + 'low'] = np.arange(8) - 1
+bars['volume'] = 10
+h4 = resample(bars[::-1], "H4", trading_day=False)
+check(
+    "resample of bars keeps the open, close, extremes and volume",
+    h4['bidopen'].tolist() == [0, 4] and h4['bidclose'].tolist() == [3.5, 7.5]
+    and h4['bidhigh'].tolist() == [4, 8] and h4['asklow'].tolist() == [-1, 3]
+    and h4['volume'].tolist() == [40, 40]
+)
@@ -0,0 +1,77 @@
+from forexconnect import CommandResponse, MarketDataSnapshot
+
+from fxcpy.listeners.response_listener import ResponseListener
+from fxcpy.tests.stand_ins import (
+    StandInCommandResponse, StandInTradingSession, check
+)
+
+import time
+
+# Offline checks of how ResponseListener routes responses to request
+# handles and to the callers of wait_events().
+#
+#   python fxcpy/tests/response_listener_test.py
+
+
+def listener():
+    response_listener = ResponseListener(StandInTradingSession())
+    # As after the initial tables of the login
+    response_listener._init_completed = True
+    return response_listener
+
+
+response_listener = listener()
+handle = response_listener.register_request('1')
+response = StandInCommandResponse(MarketDataSnapshot)
+response_listener._on_request_completed('1', response)
+check("A response completes its handle", handle.is_done())
+check(
+    "A handled response does not wake wait_events()",
+    not response_listener._event.is_set()
+)
+
+response_listener = listener()
+handle = response_listener.register_request('2', shared=True)
+response = StandInCommandResponse(CommandResponse)
+response_listener._on_request_completed('2', response)
+check("A shared handle is completed", handle.get_response() is response)
+check(
+    "A shared handle response wakes wait_events()",
+    response_listener.wait_events()
+)
+check(
+    "A shared handle response is the last response",
+    response_listener.get_response() is response
+)
+
+response_listener = listener()
+handle = response_listener.register_request('3', shared=True)
+response_listener._on_request_failed('3', "Rejected")
+check("A shared handle failure fails the handle", handle.has_error())
+check(
+    "A shared handle failure is the last error",
+    response_listener.has_error() and
+    response_listener.get_error() == "Rejected"
+)
+
+response_listener = listener()
+response_listener.register_request('4')
+response_listener.unregister_request('4')
+response_listener._on_request_completed(
+    '4', StandInCommandResponse(MarketDataSnapshot))
+check(
+    "A late response of an unregistered request is dropped",
+    not response_listener._event.is_set() and
+    response_listener._response is None
+)
+
+response_listener = listener()
+response_listener.drop_seconds = 0.05
+for request_id in ('5', '6'):
+    response_listener.register_request(request_id)
+    response_listener.unregister_request(request_id)
+    time.sleep(0.1)
+check(
+    "Unregistered request IDs are forgotten after drop_seconds",
+    list(response_listener._dropped) == ['6']
+)
@@ -0,0 +1,386 @@
+from forexconnect import MarketDataSnapshot, O2GTimeframeUnit
+
+from fxcpy.factory.price_history import MarketData
+from fxcpy.factory.resample import BAR_DTYPE
+from fxcpy.listeners.response_listener import RequestHandle
+from fxcpy.utils.date_utils import to_ole
+
+from datetime import datetime
+import numpy as np
+import time
+
+# Stand-in session, listener, request and reader objects serving
+# synthetic price history, and stand-in trading tables, so MarketData,
+# ResponseListener and the trading tables run without an FXCM login.
+# Shared by the offline tests and price_history_benchmark.py.
+
+DEPTH = 300
+START = to_ole(datetime(2010, 1, 4))
+
+
+def check(name, ok):
+    """
+    Prints and asserts one behaviour check of an offline test.
+    """
+    print("{:<60} {}".format(name, "ok" if ok else "FAILED"))
+    assert ok, name
+
+
+def raises(error, f, *args, **kwargs):
+    """
+    The error f raised, or None if it did not raise it.
+    """
+    try:
+        f(*args, **kwargs)
+    except error as e:
+        return e
+    return None
+
+
+class StandInTimeframe(object):
+    def __init__(self, name, unit, size, days):
+        self.name = name
+        self.unit = unit
+        self.size = size
+        self.days = days
+
+    def getUnit(self):
+        return self.unit
+
+    def getSize(self):
+        return self.size
+
+    def getQueryDepth(self):
+        return DEPTH
+
+
+TIMEFRAMES = {
+    'm1': StandInTimeframe('m1', O2GTimeframeUnit.Min, 1, 1.0 / 1440),
+    'H1': StandInTimeframe('H1', O2GTimeframeUnit.Hour, 1, 1.0 / 24),
+    'D1': StandInTimeframe('D1', O2GTimeframeUnit.Day, 1, 1.0),
+    't1': StandInTimeframe('t1', O2GTimeframeUnit.Tick, 1, 0.25 / 86400)
+}
+
+
+class StandInTimeframeCollection(object):
+    def get(self, timeframe):
+        return TIMEFRAMES.get(timeframe)
+
+
+class StandInRequest(object):
+    def __init__(self, request_id, instrument, timeframe):
+        self.request_id = request_id
+        self.instrument = instrument
+        self.timeframe = timeframe
+        self.dtFrom = self.dtTo = 0.0
+
+    def getRequestID(self):
+        return self.request_id
+
+
+class StandInRequestFactory(object):
+    def __init__(self):
+        # Number of requests created
+        self.created = 0
+
+    def getTimeFrameCollection(self):
+        return StandInTimeframeCollection()
+
+    def createMarketDataSnapshotRequestInstrument(
+        self, instrument, timeframe, depth
+    ):
+        self.created += 1
+        return StandInRequest(str(self.created), instrument, timeframe)
+
+    def fillMarketDataSnapshotRequestTime(
+        self, request, dtFrom, dtTo, incWeekendData, PriceMode
+    ):
+        request.dtFrom = dtFrom
+        request.dtTo = dtTo
+
+
+class StandInResponse(object):
+    """
+    One page of a synthetic series as lists of Python floats, like the
+    boost.python reader returns them.
+    """
+    def __init__(self, timeframe, rows):
+        self.tick = timeframe.name.startswith('t')
+        self.columns = dict(
+            (name, rows[name].tolist()) for name in rows.dtype.names)
+
+    def getType(self):
+        return MarketDataSnapshot
+
+    def addRef(self):
+        pass
+
+    def release(self):
+        pass
+
+
+class StandInCommandResponse(object):
+    """
+    A response of response_type, counting its references.
+    """
+    def __init__(self, response_type):
+        self.response_type = response_type
+        self.refs = 1
+
+    def getType(self):
+        return self.response_type
+
+    def addRef(self):
+        self.refs += 1
+
+    def release(self):
+        self.refs -= 1
+
+
+class StandInReader(object):
+    def __init__(self, response):
+        self.tick = response.tick
+        self.columns = response.columns
+
+    def size(self):
+        return len(self.columns['date'])
+
+    def isBar(self):
+        return not self.tick
+
+    def isTick(self):
+        return self.tick
+
+    def getDate(self, i):
+        return self.columns['date'][i]
+
+
+for _getter, _field in (
+    ('getAskOpen', 'askopen'), ('getAskHigh', 'askhigh'),
+    ('getAskLow', 'asklow'), ('getAskClose', 'askclose'),
+    ('getBidOpen', 'bidopen'), ('getBidHigh', 'bidhigh'),
+    ('getBidLow', 'bidlow'), ('getBidClose', 'bidclose'),
+    ('getVolume', 'volume'), ('getAsk', 'ask'), ('getBid', 'bid')
+):
+    setattr(
+        StandInReader, _getter,
+        (lambda field: lambda self, i: self.columns[field][i])(_field)
+    )
+
+
+class StandInReaderFactory(object):
+    def createMarketDataSnapshotReader(self, response):
+        return StandInReader(response)
+
+
+class StandInListener(object):
+    """
+    Routes each response to the RequestHandle registered for its
+    request ID, as ResponseListener does. Responses of unregistered IDs
+    are counted and dropped.
+    """
+    def __init__(self):
+        self.handles = {}
+        self.dropped = 0
+
+    def register_request(self, request_id, shared=False):
+        handle = RequestHandle(request_id, shared)
+        self.handles[request_id] = handle
+        return handle
+
+    def unregister_request(self, request_id):
+        self.handles.pop(request_id, None)
+
+    def complete(self, request_id, response):
+        handle = self.handles.pop(request_id, None)
+        if handle is None:
+            self.dropped += 1
+            return
+        handle._on_completed(response)
+
+    def fail(self, request_id, error):
+        handle = self.handles.pop(request_id, None)
+        if handle is None:
+            self.dropped += 1
+            return
+        handle._on_failed(error)
+
+
+class StandInTradingSession(object):
+    """
+    The session a ResponseListener is created with.
+    """
+    def addRef(self):
+        pass
+
+    def release(self):
+        pass
+
+    def getLoginRules(self):
+        return None
+
+    def getResponseReaderFactory(self):
+        return None
+
+
+class StandInSession(object):
+    """
+    Answers each request at once with the newest DEPTH rows between its
+    dates, as the trading server does.
+
+    Sends are numbered from 0. The response of a send in `late` is held
+    back and delivered by the send numbered by its value, before that
+    send is answered. A send in `failed` fails.
+    """
+    def __init__(self, listener, series):
+        self.listener = listener
+        self.series = series
+        self.late = {}
+        self.failed = set()
+        # (timeframe, dtFrom, dtTo) of each send
+        self.sent = []
+        # Seconds spent answering
+        self.seconds = 0.0
+        self._held = {}
+
+    def sendRequest(self, request):
+        t = time.perf_counter()
+        send = len(self.sent)
+        self.sent.append(
+            (request.timeframe.name, request.dtFrom, request.dtTo))
+        for held in sorted(self._held):
+            if self.late[held] == send:
+                self.listener.complete(*self._held.pop(held))
+        request_id = request.getRequestID()
+        if send in self.failed:
+            self.listener.fail(request_id, "Stand-in failure")
+        elif send in self.late:
+            self._held[send] = (request_id, self.respond(request))
+        else:
+            self.listener.complete(request_id, self.respond(request))
+        self.seconds += time.perf_counter() - t
+
+    def respond(self, request):
+        rows = self.series[request.timeframe.name]
+        dates = rows['date']
+        hi = len(dates)
+        if request.dtTo > 0.0:
+            hi = np.searchsorted(dates, request.dtTo + 1e-9, side='right')
+        lo = hi - DEPTH
+        if request.dtFrom > 0.0:
+            lo = max(np.searchsorted(dates, request.dtFrom - 1e-9), lo)
+        return StandInResponse(request.timeframe, rows[max(lo, 0):hi])
+
+
+def synthetic_series(timeframe, n, start=START):
+    """
+    Random walk rows with OLE Automation dates, as the reader returns
+    them.
+    """
+    rng = np.random.RandomState(0)
+    step = TIMEFRAMES[timeframe].days
+    dates = start + np.arange(n, dtype=np.float64) * step
+    mid = 1.3 + np.cumsum(rng.normal(0, 0.0001, n))
+    if timeframe.startswith('t'):
+        a = np.empty(
+            n, dtype=[('date', '<f8'), ('ask', '<f8'), ('bid', '<f8')])
+        a['date'] = dates
+        a['bid'] = np.round(mid, 5)
+        a['ask'] = np.round(mid + 0.00002, 5)
+        return a
+    a = np.empty(n, dtype=[('date', '<f8')] + BAR_DTYPE.descr[1:])
+    a['date'] = dates
+    spread = rng.uniform(0, 0.0005, (n, 2))
+    for side, offset in (('bid', 0.0), ('ask', 0.00002)):
+        a[side + 'open'] = np.round(mid + offset, 5)
+        a[side + 'close'] = np.round(mid + offset, 5)
+        a[side + 'high'] = np.round(mid + offset + spread[:, 0], 5)
+        a[side + 'low'] = np.round(mid + offset - spread[:, 1], 5)
+    a['volume'] = rng.randint(1, 1000, n)
+    return a
+
+
+def stand_in_market_data(series, **kwargs):
+    """
+    MarketData served by a StandInSession of series, a dict of the
+    synthetic_series() of each timeframe, keyword arguments are passed
+    to MarketData.
+
+    Returns : tuple (MarketData, StandInSession)
+    """
+    listener = StandInListener()
+    session = StandInSession(listener, series)
+    market_data = MarketData(
+        session, listener, StandInReaderFactory(), StandInRequestFactory(),
+        **kwargs
+    )
+    return market_data, session
+
+
+
+class StandInRow(object):
+    """
+    A trading table row answering its get getters from keyword
+    arguments, e.g. StandInRow(OfferID='1', Bid=1.1).getBid()
+    """
+    def __init__(self, **fields):
+        self.fields = fields
+
+    def release(self):
+        pass
+
+    def __getattr__(self, name):
+        fields = self.__dict__.get('fields', {})
+        if name.startswith('get') and name[3:] in fields:
+            value = fields[name[3:]]
+            return lambda: value
+        raise AttributeError(name)
+
+
+class StandInTable(object):
+    """
+    A trading table of StandInRow, found by their `key` field. Listeners
+    subscribed to its updates are kept in `listeners`.
+    """
+    def __init__(self, rows, key):
+        self.rows = list(rows)
+        self.key = key
+        self.listeners = []
+
+    def size(self):
+        return len(self.rows)
+
+    def getRow(self, i):
+        return self.rows[i]
+
+    def findRow(self, key):
+        for row in self.rows:
+            if row.fields[self.key] == key:
+                return row
+
+    def subscribeUpdate(self, update_type, listener):
+        self.listeners.append((update_type, listener))
+
+    def unsubscribeUpdate(self, update_type, listener):
+        self.listeners.remove((update_type, listener))
+
+
+class StandInTableManager(object):
+    def __init__(self, table):
+        self.table = table
+
+    def getTable(self, table_type):
+        return self.table
+
+
+def cast_to_stand_ins(*modules):
+    """
+    Makes the IO2G table and row casts of the modules keep the stand-in
+    classes, boost.python classes do not take Python objects.
+    """
+    for module in modules:
+        for name in dir(module):
+            if name.startswith('IO2G') and name.endswith('Table'):
+                setattr(module, name, StandInTable)
+            elif name.startswith('IO2G') and name.endswith('Row'):
+                setattr(module, name, StandInRow)
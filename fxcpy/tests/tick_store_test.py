@@ -0,0 +1,76 @@
+from fxcpy.factory.resample import TICK_DTYPE
+from fxcpy.factory.tick_store import CompactTicks, TickStore
+from fxcpy.tests.stand_ins import DEPTH, check
+
+import numpy as np
+import time
+
+# Offline checks of TickStore and CompactTicks.
+#
+#   python fxcpy/tests/tick_store_test.py
+
+ticks = np.zeros(1000, dtype=TICK_DTYPE)
+ticks['date'] = np.datetime64('2018-06-12T00:00', 'ms') + \
+    np.arange(1000).astype('timedelta64[ms]') * 250
+ticks['bid'] = np.round(1.3 + np.arange(1000) * 0.00001, 5)
+ticks['ask'] = np.round(ticks['bid'] + 0.00002, 5)
+tick_store = TickStore()
+tick_store.set_digits("GBP/USD", 5)
+# Newest page first, overlapping by one tick, as get_price_data yields them
+for stop in range(1000, 0, -DEPTH):
+    tick_store.add("GBP/USD", ticks[max(stop - DEPTH - 1, 0):stop])
+check(
+    "TickStore gives back the ticks it is given",
+    (tick_store.read("GBP/USD") == ticks).all()
+)
+check(
+    "TickStore reads a date range",
+    (tick_store.read(
+        "GBP/USD", ticks['date'][100], ticks['date'][199]
+    ) == ticks[100:200]).all()
+)
+check(
+    "TickStore decodes float32 prices",
+    np.allclose(
+        tick_store.read("GBP/USD", compact=True)['bid'], ticks['bid'])
+)
+tick_store.append("GBP/USD", ticks[-1:])
+check(
+    "TickStore.append keeps ticks of the same millisecond",
+    len(tick_store.read("GBP/USD")) == 1001
+)
+tick_store.add("GBP/USD", ticks[500:600])
+check(
+    "TickStore.add replaces the ticks it overlaps",
+    len(tick_store.read("GBP/USD")) == 1001
+)
+
+series = CompactTicks(5)
+try:
+    series.add(np.array(
+        [(ticks['date'][0], 1.300001, 1.3)], dtype=TICK_DTYPE))
+    rejected = False
+except AttributeError:
+    rejected = True
+check("CompactTicks rejects prices with more digits", rejected)
+
+# Paging back in time must not copy the stored ticks for every page
+n = 300000
+many = np.zeros(n, dtype=TICK_DTYPE)
+many['date'] = np.datetime64('2018-06-12T00:00', 'ms') + \
+    np.arange(n).astype('timedelta64[ms]') * 50
+many['bid'] = many['ask'] = 1.3
+newest_first = CompactTicks(5)
+t = time.perf_counter()
+for stop in range(n, 0, -DEPTH):
+    newest_first.add(many[max(stop - DEPTH - 1, 0):stop])
+seconds = time.perf_counter() - t
+t = time.perf_counter()
+oldest_first = CompactTicks(5)
+for start in range(0, n, DEPTH):
+    oldest_first.add(many[start:start + DEPTH])
+check(
+    "CompactTicks.add is as fast newest first as oldest first",
+    len(newest_first) == n and
+    seconds < 3 * (time.perf_counter() - t) + 0.1
+)
@@ -0,0 +1,171 @@
+from fxcpy.listeners import offers_listener
+from fxcpy.trading_tables import offers_table, trades_table
+from fxcpy.tests.stand_ins import (
+    StandInRow, StandInTable, StandInTableManager, cast_to_stand_ins, check,
+    raises
+)
+
+import numpy as np
+
+# Offline checks of the trading tables, read from stand-in tables.
+#
+#   python fxcpy/tests/trading_tables_offline_test.py
+
+cast_to_stand_ins(offers_listener, offers_table, trades_table)
+
+
+def offer(offer_id, instrument, bid=1.0):
+    return StandInRow(
+        OfferID=offer_id, Instrument=instrument, Bid=bid, Ask=bid + 0.0002,
+        Time=43000.5, High=bid + 0.01, Low=bid - 0.01, Volume=10
+    )
+
+
+def trade(trade_id, offer_id, buysell, amount, open_rate, pl=1.0):
+    return StandInRow(
+        TradeID=trade_id, OfferID=offer_id, AccountID='A1',
+        BuySell=buysell, Amount=amount, OpenRate=open_rate,
+        OpenTime=43000.5, Close=open_rate, Stop=0.0, Limit=0.0, PL=pl,
+        GrossPL=10 * pl, UsedMargin=amount / 1000.0, Commission=0.0,
+        RolloverInterest=0.0
+    )
+
+
+table = StandInTable(
+    [offer('1', 'EUR/USD'), offer('2', 'USD/JPY'), offer('3', 'GBP/USD')],
+    'OfferID'
+)
+offers = offers_table.OffersTable(StandInTableManager(table))
+listener = offers._listener
+check(
+    "The offers index is built from the table",
+    offers.get_offer_ids() ==
+    {'EUR/USD': '1', 'USD/JPY': '2', 'GBP/USD': '3'} and
+    offers.get_instrument('2') == 'USD/JPY' and
+    offers.get_row_position('3') == 2
+)
+table.rows.append(offer('4', 'AUD/USD'))
+listener._on_added('4', table.rows[-1])
+check(
+    "An added offer is indexed at the end of the table",
+    offers.find_offer_id('AUD/USD') == '4' and
+    offers.get_row_position('4') == 3
+)
+listener._on_deleted('2', table.rows.pop(1))
+check(
+    "A deleted offer leaves the index",
+    offers.find_offer_id('USD/JPY') is None and
+    offers.get_instrument('2') is None
+)
+check(
+    "The offers after a deleted one move up",
+    all(
+        offers.get_row_position(row.getOfferID()) == i
+        for i, row in enumerate(table.rows)
+    )
+)
+offers.unsubscribe_events()
+check("unsubscribe_events stops the index updates", table.listeners == [])
+
+# The quote cache serves the prices of the last Offers update
+table = StandInTable(
+    [offer('1', 'EUR/USD', 1.1), offer('2', 'USD/JPY', 110.0)], 'OfferID')
+offers = offers_table.OffersTable(StandInTableManager(table))
+listener = offers._listener
+check("The quote cache is off by default", offers.get_sequence() is None)
+offers.enable_quote_cache(capacity=2)
+table.rows[0].fields['Bid'] = 1.2
+check(
+    "Cached quotes are served without reading the table",
+    offers.get_bid('1') == 1.1 and offers.get_volume('2') == 10
+)
+sequence = offers.get_sequence()
+listener._on_changed('1', table.rows[0])
+check(
+    "An update refreshes the quote with a new sequence number",
+    offers.get_bid('1') == 1.2 and
+    offers.get_sequence('1') == offers.get_sequence() > sequence and
+    offers.get_quote('1')['seq'] == offers.get_sequence('1')
+)
+table.rows.append(offer('3', 'GBP/USD', 1.3))
+listener._on_added('3', table.rows[-1])
+check(
+    "The cache grows past its capacity",
+    offers.get_bid('3') == 1.3 and len(offers.get_quotes()) == 3
+)
+listener._on_deleted('1', table.rows.pop(0))
+check(
+    "The quotes after a deleted offer move up",
+    offers.get_quotes()['bid'].tolist() == [110.0, 1.3] and
+    offers.get_bid('1') is None
+)
+offers.disable_quote_cache()
+table.rows[0].fields['Bid'] = 111.0
+check(
+    "Without the cache the table is read",
+    offers.get_bid('2') == 111.0 and offers.get_quotes() is None
+)
+
+# get_row reads several fields of a row at once
+row = offers.get_row('2', ('instrument', 'bid'))
+check(
+    "get_row returns the fields asked for in order",
+    tuple(row) == ('USD/JPY', 111.0) and row.instrument == 'USD/JPY'
+)
+check(
+    "get_row reuses the record type of the same fields",
+    type(offers.get_row('3', ('instrument', 'bid'))) is type(row)
+)
+check("get_row of an unknown row is None", offers.get_row('9') is None)
+check(
+    "get_row rejects unknown fields",
+    'bid' in offers.get_row_fields() and
+    raises(AttributeError, offers.get_row, '2', ('spread',)) is not None
+)
+trades = trades_table.TradesTable(StandInTableManager(StandInTable(
+    [trade('T1', '1', 'B', 1000, 1.1)], 'TradeID')))
+row = trades.get_row('T1', ('amount', 'buysell', 'pl'))
+check(
+    "get_row reads trades rows",
+    row == (1000, 'B', 1.0) and type(row).__name__ == 'TradeRow'
+)
+
+# get_positions aggregates the open trades of each offer
+trades = trades_table.TradesTable(StandInTableManager(StandInTable([
+    trade('T1', '1', 'B', 1000, 1.10, 1.0),
+    trade('T2', '1', 'B', 3000, 1.20, 2.0),
+    trade('T3', '1', 'S', 2000, 1.15, -1.0),
+    trade('T4', '2', 'S', 1000, 110.0, 0.5)
+], 'TradeID')))
+array = trades.to_array()
+check(
+    "to_array reads every open trade",
+    array['trade_id'].tolist() == ['T1', 'T2', 'T3', 'T4'] and
+    array['amount'].dtype == np.int64
+)
+positions = trades.get_positions()
+first, second = positions
+check(
+    "get_positions has one row per offer",
+    positions['offer_id'].tolist() == ['1', '2'] and
+    positions['trades'].tolist() == [3, 1]
+)
+check(
+    "get_positions nets the amounts of each side",
+    (first['buy_amount'], first['sell_amount'], first['net_amount']) ==
+    (4000, 2000, 2000) and second['net_amount'] == -1000
+)
+check(
+    "get_positions weights the open rates by amount",
+    abs(first['buy_avg_open'] - 1.175) < 1e-12 and
+    first['sell_avg_open'] == 1.15 and np.isnan(second['buy_avg_open'])
+)
+check(
+    "get_positions sums pl, gross_pl and used_margin",
+    first['pl'] == 2.0 and first['gross_pl'] == 20.0 and
+    first['used_margin'] == 6.0
+)
+check(
+    "get_positions of no trades is empty",
+    len(trades.get_positions(array[:0])) == 0
+)
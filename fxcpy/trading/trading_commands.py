@@ -27,7 +27,7 @@ log = Log().logger
 
 class TradingCommands(object):
     def __init__(
-        self, session, account_id, offer_attribs
+        self, session, account_id, offer_attribs, response_listener=None
     ):
         """
         
@@ -36,6 +36,7 @@ class TradingCommands(object):
         self._offer_attribs = offer_attribs
         self.account_id = account_id
         self._session = session
+        self._response_listener = response_listener
         session.addRef()
         self._request_factory = session.getRequestFactory()
 
@@ -48,6 +49,9 @@ class TradingCommands(object):
     def _send_request(self, valuemap):
         """
         Send order request to the trading server.
+
+        Returns: RequestHandle if a response listener is attached,
+        otherwise None.
         """
         log.debug("")
         if not self._request_factory:
@@ -57,7 +61,13 @@ class TradingCommands(object):
             raise ValueError("Request Factory error: {}".format(
                 self._request_factory.getLastError())
             )
+        handle = None
+        if self._response_listener:
+            # Responses also wake callers of response_listener.wait_events()
+            handle = self._response_listener.register_request(
+                request.getRequestID(), shared=True)
         self._session.sendRequest(request)
+        return handle
         
     def create_valuemap(self, valuemap_type="CreateOrder"):
         """
@@ -107,15 +117,16 @@ class TradingCommands(object):
         valuemap = self.create_valuemap("SetSubscriptionStatus")
         valuemap.setString(O2G.OfferID, offer_id)
         valuemap.setString(O2G.SubscriptionStatus, status)
-        self._send_request(valuemap)
+        return self._send_request(valuemap)
         
     def execute_order(self, valuemap):
         """
         Send order for execution
         """
         log.debug("")
-        self._send_request(valuemap)
+        handle = self._send_request(valuemap)
         log.info("Request has been sent to the execution server")
+        return handle
         
     def create_open_market_order(
         self,
@@ -1285,17 +1296,17 @@ class TradingCommands(object):
         the time of login but was subscribed later. It is used to get margin
         requirements for an instrument after subscribing to it.
         
-        Returns: Nothing 
+        Returns: RequestHandle 
         """
         log.debug("")
         valuemap = self.create_valuemap("UpdateMarginRequirements")
-        self._send_request(valuemap)
+        return self._send_request(valuemap)
 
     def get_last_order_update(self, account_name, order_id):
         """
         Get the up-to-date order information from the server.
         
-        Returns: Nothing
+        Returns: RequestHandle
         
         """
         if not isinstance(account_name, str):
@@ -1312,13 +1323,13 @@ class TradingCommands(object):
         valuemap.setString(O2G.AccountName, account_name)
         valuemap.setString(O2G.Key, O2G2.KeyType.OrderID)
         valuemap.setString(O2G.Id, order_id)
-        self._send_request(valuemap)
+        return self._send_request(valuemap)
          
     def accept_order(self, order_id):
         """
         Accept order requoted by the dealer.
 
-        Returns: Nothing
+        Returns: RequestHandle
         """
         log.debug("")
         
@@ -1331,13 +1342,13 @@ class TradingCommands(object):
         
         valuemap = self.create_valuemap("AcceptOrder")
         valuemap.setString(O2G.OrderID, order_id)
-        self._send_request(valuemap)
+        return self._send_request(valuemap)
 
     def change_password(self, new_password):
         """
         Change current password to a new one.
         
-        Returns: Nothing 
+        Returns: RequestHandle 
         """
         log.debug("")
         
@@ -1346,4 +1357,4 @@ class TradingCommands(object):
         
         valuemap = self.create_valuemap("ChangePassword")
         valuemap.setString(O2G.Psw, new_password)
-        self._send_request(valuemap)
\ No newline at end of file
+        return self._send_request(valuemap)
\ No newline at end of file
@@ -26,8 +26,42 @@ from forexconnect import (
     O2GTable
 )
 
+from .row_records import RowRecords
+
+
+class ClosedTradesTable(RowRecords):
+    # get_row() fields and their row getters
+    _row_fields = (
+        ('trade_id', 'getTradeID'),
+        ('account_id', 'getAccountID'),
+        ('account_name', 'getAccountName'),
+        ('account_kind', 'getAccountKind'),
+        ('offer_id', 'getOfferID'),
+        ('amount', 'getAmount'),
+        ('buysell', 'getBuySell'),
+        ('gross_pl', 'getGrossPL'),
+        ('commission', 'getCommission'),
+        ('rollover_interest', 'getRolloverInterest'),
+        ('open_rate', 'getOpenRate'),
+        ('openquote_id', 'getOpenQuoteID'),
+        ('open_time', 'getOpenTime'),
+        ('open_order_id', 'getOpenOrderID'),
+        ('open_order_req_id', 'getOpenOrderReqID'),
+        ('open_order_request_txt', 'getOpenOrderRequestTXT'),
+        ('open_order_parties', 'getOpenOrderParties'),
+        ('close_rate', 'getCloseRate'),
+        ('close_quote_id', 'getCloseQuoteID'),
+        ('close_time', 'getCloseTime'),
+        ('close_order_id', 'getCloseOrderID'),
+        ('close_order_req_id', 'getCloseOrderReqID'),
+        ('close_order_request_txt', 'getCloseOrderRequestTXT'),
+        ('close_order_parties', 'getCloseOrderParties'),
+        ('trade_id_origin', 'getTradeIDOrigin'),
+        ('trade_id_remain', 'getTradeIDRemain'),
+        ('value_date', 'getValueDate')
+    )
+    _record_name = 'ClosedTradeRow'
 
-class ClosedTradesTable(object):
     def __init__(self, table_manager):
         self._table_manager = table_manager
         self._set_table()
@@ -26,14 +26,67 @@ from forexconnect import (
     O2GTable
 )
 
+from fxcpy.listeners.offers_listener import OffersListener
+
+from .row_records import RowRecords
+
+from threading import Lock
+import numpy as np
+
+
+class OffersTable(RowRecords):
+    # snapshot() column, row getter and dtype (None for strings)
+    _snapshot_fields = (
+        ('offer_id', 'getOfferID', None),
+        ('instrument', 'getInstrument', None),
+        ('quote_id', 'getQuoteID', None),
+        ('bid', 'getBid', '<f8'),
+        ('ask', 'getAsk', '<f8'),
+        ('bid_tradable', 'getBidTradable', None),
+        ('ask_tradable', 'getAskTradable', None),
+        ('high', 'getHigh', '<f8'),
+        ('low', 'getLow', '<f8'),
+        ('buy_interest', 'getBuyInterest', '<f8'),
+        ('sell_interest', 'getSellInterest', '<f8'),
+        ('volume', 'getVolume', '<i8'),
+        ('contract_currency', 'getContractCurrency', None),
+        ('digits', 'getDigits', '<i8'),
+        ('point_size', 'getPointSize', '<f8'),
+        ('subscription_status', 'getSubscriptionStatus', None),
+        ('trading_status', 'getTradingStatus', None),
+        ('instrument_type', 'getInstrumentType', '<i8'),
+        ('contract_multiplier', 'getContractMultiplier', '<i8'),
+        ('value_date', 'getValueDate', None),
+        ('time', 'getTime', '<f8')
+    )
+    # get_row() fields and their row getters
+    _row_fields = tuple(field[:2] for field in _snapshot_fields)
+    _record_name = 'OfferRow'
+
+    # Columns of the quote cache, see enable_quote_cache()
+    quote_dtype = np.dtype(
+        [('seq', '<i8'), ('bid', '<f8'), ('ask', '<f8'), ('time', '<f8'),
+         ('high', '<f8'), ('low', '<f8'), ('volume', '<i8')]
+    )
 
-class OffersTable(object):
     def __init__(self, table_manager):
         if not table_manager:
             raise AttributeError("Table Manager not loaded")
         self._table_manager = table_manager
         self._set_table()
-    
+        self._lock = Lock()
+        # instrument: offer_id, offer_id: instrument and offer_id: row
+        # position, built once and kept current by the OffersListener
+        self._offer_ids = {}
+        self._instruments = {}
+        self._positions = {}
+        # Quote cache, None until enable_quote_cache() is called
+        self._quotes = None
+        self._seq = 0
+        self._build_index()
+        self._listener = OffersListener(self)
+        self._listener.subscribe_events(self._table_manager)
+
     def _set_table(self):        
         self._table = self._table_manager.getTable(O2GTable.Offers)
         self._table.__class__ = IO2GOffersTable
@@ -45,21 +98,244 @@ class OffersTable(object):
             row.release()
             return row
 
+    def _build_index(self):
+        with self._lock:
+            self._offer_ids.clear()
+            self._instruments.clear()
+            self._positions.clear()
+            for i in range(self._table.size()):
+                row = self._table.getRow(i)
+                if row:
+                    row.__class__ = IO2GOfferRow
+                    self._index_row(row, i)
+                    row.release()
+
+    def _index_row(self, row, position):
+        offer_id = row.getOfferID()
+        instrument = row.getInstrument()
+        self._offer_ids[instrument] = offer_id
+        self._instruments[offer_id] = instrument
+        self._positions[offer_id] = position
+
+    # OffersListener CallBack
+    def _on_offer_added(self, row):
+        with self._lock:
+            offer_id = row.getOfferID()
+            if offer_id in self._positions:
+                position = self._positions[offer_id]
+            else:
+                # New rows are appended to the table
+                position = len(self._positions)
+            self._index_row(row, position)
+            if self._quotes is not None:
+                self._put_quote(row, position)
+
+    # OffersListener CallBack
+    def _on_offer_deleted(self, row):
+        with self._lock:
+            offer_id = row.getOfferID()
+            position = self._positions.pop(offer_id, None)
+            instrument = self._instruments.pop(offer_id, None)
+            if self._offer_ids.get(instrument) == offer_id:
+                del self._offer_ids[instrument]
+            if position is None:
+                return
+            # Rows after the deleted one move up by one
+            for key, value in self._positions.items():
+                if value > position:
+                    self._positions[key] = value - 1
+            if self._quotes is not None:
+                n = len(self._positions)
+                self._quotes[position:n] = self._quotes[position + 1:n + 1]
+
+    # OffersListener CallBack
+    def _on_offer_changed(self, row):
+        with self._lock:
+            if self._quotes is None:
+                return
+            position = self._positions.get(row.getOfferID())
+            if position is not None:
+                self._put_quote(row, position)
+
+    def _put_quote(self, row, position):
+        if position >= len(self._quotes):
+            quotes = np.zeros(2 * position + 1, dtype=self.quote_dtype)
+            quotes[:len(self._quotes)] = self._quotes
+            self._quotes = quotes
+        self._seq += 1
+        self._quotes[position] = (
+            self._seq, row.getBid(), row.getAsk(), row.getTime(),
+            row.getHigh(), row.getLow(), row.getVolume()
+        )
+
+    def _get_quote_field(self, offer_id, field, getter):
+        with self._lock:
+            if self._quotes is not None:
+                position = self._positions.get(offer_id)
+                if position is not None:
+                    return self._quotes[field][position].item()
+                return None
+        row = self._find_row(offer_id)
+        if row:
+            return getattr(row, getter)()
+
+    def unsubscribe_events(self):
+        """
+        Stops keeping the offers index current, for when the table
+        manager is no longer used.
+        """
+        self.disable_quote_cache()
+        self._listener.unsubscribe_events(self._table_manager)
+
+    def enable_quote_cache(self, capacity=None):
+        """
+        Mirrors bid, ask, time, high, low and volume of every offer in a
+        Numpy array kept current by the Offers updates, so get_bid(),
+        get_ask(), get_time(), get_high(), get_low() and get_volume()
+        are served without calling into the table.
+
+        Optional :
+            > int number of offers to allocate for, by default twice the
+              size of the table. The array grows when more are added.
+
+        Every update of a row sets its seq to a new, higher number, see
+        get_sequence().
+        """
+        with self._lock:
+            if self._quotes is not None:
+                return
+            if capacity is None:
+                capacity = 2 * max(len(self._positions), 1)
+            self._quotes = np.zeros(capacity, dtype=self.quote_dtype)
+            for i in range(self._table.size()):
+                row = self._table.getRow(i)
+                if row:
+                    row.__class__ = IO2GOfferRow
+                    position = self._positions.get(row.getOfferID())
+                    if position is not None:
+                        self._put_quote(row, position)
+                    row.release()
+        self._listener.subscribe_updates(self._table_manager)
+
+    def disable_quote_cache(self):
+        """
+        Stops the quote cache, the getters read the table again.
+        """
+        with self._lock:
+            if self._quotes is None:
+                return
+            self._quotes = None
+        self._listener.unsubscribe_updates(self._table_manager)
+
+    def get_quote(self, offer_id):
+        """
+        Copy of the cached quote of the offer, a record of quote_dtype,
+        or None if the quote cache is disabled or the offer is unknown.
+        """
+        with self._lock:
+            position = self._positions.get(offer_id)
+            if self._quotes is None or position is None:
+                return None
+            return self._quotes[position].copy()
+
+    def get_quotes(self):
+        """
+        Copy of the cached quotes of every offer, in get_row_position()
+        order, or None if the quote cache is disabled.
+
+        Returns: Structured Numpy Array of quote_dtype
+        """
+        with self._lock:
+            if self._quotes is None:
+                return None
+            return self._quotes[:len(self._positions)].copy()
+
+    def get_sequence(self, offer_id=None):
+        """
+        Sequence number of the last quote update of the offer, or of any
+        offer when offer_id is None. A reader can compare it to the seq
+        of the quote it holds to find out if the quote is stale.
+
+        Returns: int or None
+        """
+        with self._lock:
+            if self._quotes is None:
+                return None
+            if offer_id is None:
+                return self._seq
+            position = self._positions.get(offer_id)
+            if position is not None:
+                return int(self._quotes['seq'][position])
+
     def get_offer_ids(self):
         """
-        The unique identification number of the instrument.	
+        The unique identification number of each instrument, from the
+        index kept by the table notifications.
 
         Returns: dict
 
         """
-        offers_dict = {}
+        with self._lock:
+            return dict(self._offer_ids)
+
+    def find_offer_id(self, instrument):
+        """
+        The unique identification number of the instrument symbol, e.g.
+        "EUR/USD", without reading the table.
+
+        Returns: string or None
+
+        """
+        return self._offer_ids.get(instrument)
+
+    def get_row_position(self, offer_id):
+        """
+        The position of the offer in the table, as passed to getRow(),
+        which is also its index in the snapshot() arrays.
+
+        Returns: int or None
+
+        """
+        return self._positions.get(offer_id)
+
+    def snapshot(self, fields=None):
+        """
+        Reads every row of the table once, instead of one findRow for
+        each getter call.
+
+        Optional :
+            > list of columns, e.g. ["instrument", "bid", "ask"], by
+              default every column of the get_ getters below, named
+              after them. offer_id is always included.
+
+        Rows are in table order. String columns are unicode arrays and
+        time is an OLE Automation date, as returned by get_time().
+
+        Returns: dict of column name: Numpy Array
+        """
+        if fields is None:
+            spec = self._snapshot_fields
+        else:
+            known = dict((f[0], f) for f in self._snapshot_fields)
+            unknown = set(fields) - set(known)
+            if unknown:
+                raise AttributeError(
+                    "Unknown offers fields {}".format(sorted(unknown)))
+            spec = [known['offer_id']] + [
+                known[name] for name in fields if name != 'offer_id']
+        values = [[] for _ in spec]
         for i in range(self._table.size()):
             row = self._table.getRow(i)
             if row:
                 row.__class__ = IO2GOfferRow
-                offers_dict[row.getInstrument()] = row.getOfferID()
+                for column, (name, getter, dtype) in zip(values, spec):
+                    column.append(getattr(row, getter)())
                 row.release()
-        return offers_dict
+        return dict(
+            (name, np.array(column, dtype=dtype) if dtype
+             else np.array(column, dtype=str))
+            for column, (name, getter, dtype) in zip(values, spec)
+        )
 
     def get_instrument(self, offer_id):
         """
@@ -68,9 +344,7 @@ class OffersTable(object):
         Returns: string
 
         """
-        row = self._find_row(offer_id)
-        if row:
-            return row.getInstrument()
+        return self._instruments.get(offer_id)
 
     def get_quote_id(self, offer_id):
         """
@@ -94,9 +368,7 @@ class OffersTable(object):
         Returns: double
 
         """
-        row = self._find_row(offer_id)
-        if row:
-            return row.getBid()
+        return self._get_quote_field(offer_id, 'bid', 'getBid')
 
     def get_ask(self, offer_id):
         """
@@ -108,9 +380,7 @@ class OffersTable(object):
         Returns: double
 
         """
-        row = self._find_row(offer_id)
-        if row:
-            return row.getAsk()
+        return self._get_quote_field(offer_id, 'ask', 'getAsk')
 
     def get_bid_tradable(self, offer_id):
         """
@@ -154,9 +424,7 @@ class OffersTable(object):
         Returns: double
 
         """
-        row = self._find_row(offer_id)
-        if row:
-            return row.getHigh()
+        return self._get_quote_field(offer_id, 'high', 'getHigh')
 
     def get_low(self, offer_id):
         """
@@ -170,9 +438,7 @@ class OffersTable(object):
         Returns: double
 
         """
-        row = self._find_row(offer_id)
-        if row:
-            return row.getLow()
+        return self._get_quote_field(offer_id, 'low', 'getLow')
 
     def get_buy_interest(self, offer_id):
         """
@@ -228,9 +494,7 @@ class OffersTable(object):
         Returns: integer
 
         """
-        row = self._find_row(offer_id)
-        if row:
-            return row.getVolume()
+        return self._get_quote_field(offer_id, 'volume', 'getVolume')
 
     def get_contract_currency(self, offer_id):
         """
@@ -386,9 +650,7 @@ class OffersTable(object):
         Returns: date
 
         """
-        row = self._find_row(offer_id)
-        if row:
-            return row.getTime()
+        return self._get_quote_field(offer_id, 'time', 'getTime')
 
 ##    def get_pip_cost(self, offer_id):
 ##        """
@@ -26,8 +26,54 @@ from forexconnect import (
     O2GTable
 )
 
+from .row_records import RowRecords
+
+
+class OrdersTable(RowRecords):
+    # get_row() fields and their row getters
+    _row_fields = (
+        ('order_id', 'getOrderID'),
+        ('request_id', 'getRequestID'),
+        ('rate', 'getRate'),
+        ('execution_rate', 'getExecutionRate'),
+        ('rate_min', 'getRateMin'),
+        ('rate_max', 'getRateMax'),
+        ('trade_id', 'getTradeID'),
+        ('account_id', 'getAccountID'),
+        ('account_name', 'getAccountName'),
+        ('offer_id', 'getOfferID'),
+        ('net_quantity', 'getNetQuantity'),
+        ('buy_sell', 'getBuySell'),
+        ('stage', 'getStage'),
+        ('type', 'getType'),
+        ('status', 'getStatus'),
+        ('amount', 'getAmount'),
+        ('status_time', 'getStatusTime'),
+        ('life_time', 'getLifetime'),
+        ('at_market', 'getAtMarket'),
+        ('trail_step', 'getTrailStep'),
+        ('trail_rate', 'getTrailRate'),
+        ('time_inforce', 'getTimeInForce'),
+        ('account_kind', 'getAccountKind'),
+        ('request_txt', 'getRequestTXT'),
+        ('contingent_order_id', 'getContingentOrderID'),
+        ('contingency_type', 'getContingencyType'),
+        ('primary_id', 'getPrimaryID'),
+        ('origin_amount', 'getOriginAmount'),
+        ('filled_amount', 'getFilledAmount'),
+        ('working_indicator', 'getWorkingIndicator'),
+        ('peg_type', 'getPegType'),
+        ('peg_offset', 'getPegOffset'),
+        ('expire_date', 'getExpireDate'),
+        ('value_date', 'getValueDate'),
+        ('parties', 'getParties'),
+        ('limit', 'getLimit'),
+        ('stop', 'getStop'),
+        ('stop_trail_step', 'getStopTrailStep'),
+        ('stop_trail_rate', 'getStopTrailRate')
+    )
+    _record_name = 'OrderRow'
 
-class OrdersTable(object):
     def __init__(self, table_manager):
         self._table_manager = table_manager
         self._set_table()
@@ -0,0 +1,91 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 James K Bowler, Data Centauri Ltd
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+from collections import namedtuple
+from threading import Lock
+
+# (table class, fields): (record type, row getters)
+_specs = {}
+_specs_lock = Lock()
+
+
+class RowRecords(object):
+    """
+    Reads several fields of a trading table row with a single findRow,
+    instead of one for each get_ getter.
+
+    Tables list their fields in _row_fields as (field, row getter)
+    pairs, named after the get_ getters, and name the records with
+    _record_name.
+    """
+    _row_fields = ()
+    _record_name = 'Row'
+
+    @classmethod
+    def get_row_fields(cls):
+        """
+        Names of the fields get_row() can read.
+
+        Returns: list
+        """
+        return [field for field, getter in cls._row_fields]
+
+    @classmethod
+    def _row_spec(cls, fields):
+        key = (cls, fields)
+        spec = _specs.get(key)
+        if spec is None:
+            known = dict(cls._row_fields)
+            names = cls.get_row_fields() if fields is None else list(fields)
+            unknown = [name for name in names if name not in known]
+            if unknown:
+                raise AttributeError(
+                    "Unknown {} fields {}".format(cls._record_name, unknown))
+            spec = (
+                namedtuple(cls._record_name, names),
+                tuple(known[name] for name in names)
+            )
+            with _specs_lock:
+                _specs[key] = spec
+        return spec
+
+    def get_row(self, key, fields=None):
+        """
+        Several fields of one row, looked up once.
+
+        Params :
+            str the row id passed to the get_ getters, e.g. trade_id
+
+        Optional :
+            > tuple of field names, e.g. ("amount", "buysell", "pl"), by
+              default every field of get_row_fields(). Pass the same
+              tuple on every call, its record type is created once.
+
+        Returns: namedtuple of the fields in the given order, or None
+        if the row is not found
+        """
+        if fields is not None:
+            fields = tuple(fields)
+        record, getters = self._row_spec(fields)
+        row = self._find_row(key)
+        if row:
+            return record._make([getattr(row, getter)() for getter in getters])
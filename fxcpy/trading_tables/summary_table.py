@@ -26,8 +26,29 @@ from forexconnect import (
     O2GTable
 )
 
+from .row_records import RowRecords
+
+
+class SummaryTable(RowRecords):
+    # get_row() fields and their row getters
+    _row_fields = (
+        ('offer_id', 'getOfferID'),
+        ('default_sort_order', 'getDefaultSortOrder'),
+        ('instrument', 'getInstrument'),
+        ('sell_net_pl', 'getSellNetPL'),
+        ('sell_amount', 'getSellAmount'),
+        ('sell_avg_open', 'getSellAvgOpen'),
+        ('buy_close', 'getBuyClose'),
+        ('sell_close', 'getSellClose'),
+        ('buy_avg_open', 'getBuyAvgOpen'),
+        ('buy_amount', 'getBuyAmount'),
+        ('buy_net_pl', 'getBuyNetPL'),
+        ('amount', 'getAmount'),
+        ('gross_pl', 'getGrossPL'),
+        ('net_pl', 'getNetPL')
+    )
+    _record_name = 'SummaryRow'
 
-class SummaryTable(object):
     def __init__(self, table_manager):
         self._table_manager = table_manager
         self._set_table()
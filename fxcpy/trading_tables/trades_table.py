@@ -26,7 +26,58 @@ from forexconnect import (
     O2GTable
 )
 
-class TradesTable(object):
+from .row_records import RowRecords
+
+import numpy as np
+
+class TradesTable(RowRecords):
+    # get_row() fields and their row getters
+    _row_fields = (
+        ('trade_id', 'getTradeID'),
+        ('account_id', 'getAccountID'),
+        ('account_name', 'getAccountName'),
+        ('account_kind', 'getAccountKind'),
+        ('offer_id', 'getOfferID'),
+        ('amount', 'getAmount'),
+        ('buysell', 'getBuySell'),
+        ('open_rate', 'getOpenRate'),
+        ('open_time', 'getOpenTime'),
+        ('open_quote_id', 'getOpenQuoteID'),
+        ('open_order_id', 'getOpenOrderID'),
+        ('open_order_req_id', 'getOpenOrderReqID'),
+        ('open_order_request_txt', 'getOpenOrderRequestTXT'),
+        ('commission', 'getCommission'),
+        ('rollover_interest', 'getRolloverInterest'),
+        ('tradeid_origin', 'getTradeIDOrigin'),
+        ('used_margin', 'getUsedMargin'),
+        ('value_date', 'getValueDate'),
+        ('parties', 'getParties'),
+        ('close', 'getClose'),
+        ('gross_pl', 'getGrossPL'),
+        ('limit', 'getLimit'),
+        ('pl', 'getPL'),
+        ('stop', 'getStop')
+    )
+    _record_name = 'TradeRow'
+    # to_array() column, row getter and dtype (None for strings)
+    _array_fields = (
+        ('trade_id', 'getTradeID', None),
+        ('offer_id', 'getOfferID', None),
+        ('account_id', 'getAccountID', None),
+        ('amount', 'getAmount', '<i8'),
+        ('buysell', 'getBuySell', None),
+        ('open_rate', 'getOpenRate', '<f8'),
+        ('open_time', 'getOpenTime', '<f8'),
+        ('close', 'getClose', '<f8'),
+        ('stop', 'getStop', '<f8'),
+        ('limit', 'getLimit', '<f8'),
+        ('pl', 'getPL', '<f8'),
+        ('gross_pl', 'getGrossPL', '<f8'),
+        ('used_margin', 'getUsedMargin', '<f8'),
+        ('commission', 'getCommission', '<f8'),
+        ('rollover_interest', 'getRolloverInterest', '<f8')
+    )
+
     def __init__(self, table_manager):
         self._table_manager = table_manager
         self._set_table()
@@ -70,6 +121,86 @@ class TradesTable(object):
                 trade_row.release()
         return trades_dict
     
+    def to_array(self):
+        """
+        Reads every open trade once into a Structured Numpy Array, with
+        the columns of _array_fields named after their get_ getters.
+
+        String columns are unicode and the dates are OLE Automation
+        dates, as returned by the getters.
+
+        Returns: Structured Numpy Array
+        """
+        values = [[] for _ in self._array_fields]
+        for i in range(self._table.size()):
+            row = self._table.getRow(i)
+            if row:
+                row.__class__ = IO2GTradeRow
+                for column, (name, getter, dtype) in zip(
+                    values, self._array_fields
+                ):
+                    column.append(getattr(row, getter)())
+                row.release()
+        columns = [
+            np.array(column, dtype=dtype) if dtype
+            else np.array(column, dtype=str)
+            for column, (name, getter, dtype) in zip(
+                values, self._array_fields)
+        ]
+        trades = np.empty(len(columns[0]), dtype=[
+            (name, column.dtype) for column, (name, getter, dtype) in zip(
+                columns, self._array_fields)
+        ])
+        for column, field in zip(columns, self._array_fields):
+            trades[field[0]] = column
+        return trades
+
+    def get_positions(self, trades=None):
+        """
+        Open positions of each offer, aggregated over its trades.
+
+        Optional :
+            > Structured Numpy Array from to_array(), read from the
+              table by default
+
+        net_amount is buy_amount less sell_amount, buy_avg_open and
+        sell_avg_open are the open rates weighted by amount (nan when
+        there is no trade on that side), pl, gross_pl and used_margin
+        are summed.
+
+        Returns: Structured Numpy Array, one row per offer_id, sorted
+        """
+        if trades is None:
+            trades = self.to_array()
+        offer_ids, idx = np.unique(trades['offer_id'], return_inverse=True)
+        idx = idx.ravel()
+        n = len(offer_ids)
+        amount = trades['amount'].astype(np.float64)
+        buy = trades['buysell'] == 'B'
+        buy_amount = np.bincount(idx, amount * buy, n)
+        sell_amount = np.bincount(idx, amount * ~buy, n)
+        weighted = amount * trades['open_rate']
+        buy_open = np.bincount(idx, weighted * buy, n)
+        sell_open = np.bincount(idx, weighted * ~buy, n)
+        positions = np.empty(n, dtype=[
+            ('offer_id', offer_ids.dtype), ('trades', '<i8'),
+            ('buy_amount', '<i8'), ('sell_amount', '<i8'),
+            ('net_amount', '<i8'), ('buy_avg_open', '<f8'),
+            ('sell_avg_open', '<f8'), ('pl', '<f8'), ('gross_pl', '<f8'),
+            ('used_margin', '<f8')
+        ])
+        positions['offer_id'] = offer_ids
+        positions['trades'] = np.bincount(idx, minlength=n)
+        positions['buy_amount'] = buy_amount
+        positions['sell_amount'] = sell_amount
+        positions['net_amount'] = buy_amount - sell_amount
+        with np.errstate(invalid='ignore', divide='ignore'):
+            positions['buy_avg_open'] = buy_open / buy_amount
+            positions['sell_avg_open'] = sell_open / sell_amount
+        for field in ('pl', 'gross_pl', 'used_margin'):
+            positions[field] = np.bincount(idx, trades[field], n)
+        return positions
+
     def get_account_id(self, trade_id):
         """
         A distinctive identification of the account. The number 
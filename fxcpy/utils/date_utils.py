@@ -22,6 +22,16 @@
 #
 from datetime import datetime, timedelta
 
+import numpy as np
+
+# OLE Automation date zero and the number of units in one OLE day
+OLE_ZERO = np.datetime64('1899-12-30T00:00:00')
+OLE_DAY = {
+    's': 86400,
+    'ms': 86400000,
+    'us': 86400000000
+}
+
 def ole_zero():
     return datetime(1899,12,30)
 
@@ -37,3 +47,24 @@ def fm_ole(oletime):
         return ole_zero() + timedelta(days=float(oletime))
     else:
         return oletime
+
+def to_ole_array(dates):
+    """
+    Vectorised to_ole, converts an array of datetime64 to an
+    array of float64 OLE Automation dates.
+    """
+    dates = np.asarray(dates, dtype='datetime64')
+    return (dates - OLE_ZERO) / np.timedelta64(1, 'D')
+
+def fm_ole_array(oletimes, unit='s'):
+    """
+    Vectorised fm_ole, converts an array of float64 OLE Automation
+    dates to datetime64[unit], rounded to the nearest unit.
+    """
+    if unit not in OLE_DAY:
+        raise AttributeError(
+            "unit must be either {}".format(list(OLE_DAY)))
+    days = np.asarray(oletimes, dtype=np.float64)
+    delta = np.rint(days * OLE_DAY[unit]).astype(np.int64)
+    return OLE_ZERO.astype('datetime64[{}]'.format(unit)) + \
+        delta.astype('timedelta64[{}]'.format(unit))